@@ -3,13 +3,13 @@
 In this example we will implement a DNS packet according to RFC 1035.
 There is a client example to show how to use it in real cases.
 """
-import enum
+import functools
 import ipaddress
 import random
 import socket
 import string
 import struct
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import attr
 
@@ -27,22 +27,25 @@ from kifurushi import (
 )
 
 
-def check_ip_address(_, _param, address: str) -> bool:
+def pack_ip_address(address: str) -> bytes:
+    # inet_pton is much cheaper than creating an ipaddress object when we only need the packed form
+    family = socket.AF_INET6 if ':' in address else socket.AF_INET
     try:
-        ipaddress.ip_address(address)
-        return True
-    except ipaddress.AddressValueError as e:
+        return socket.inet_pton(family, address)
+    except OSError as e:
         raise ValueError(f'{address} is not a valid ip address') from e
 
 
 @attr.s(slots=True, repr=False)
 class IPField(Field):
     _name: str = attr.ib(validator=attr.validators.instance_of(str))
-    _default: str = attr.ib(validator=check_ip_address)
-    _address: Union[ipaddress.IPv4Address, ipaddress.IPv6Address] = attr.ib(init=False)
-
-    def __attrs_post_init__(self):
-        self._address = ipaddress.ip_address(self._default)
+    _default: str = attr.ib()
+    # the packed address is the source of truth, its text form is only computed when the value is read
+    # packing the default value is enough to validate it
+    _packed: bytes = attr.ib(
+        init=False, default=attr.Factory(lambda self: pack_ip_address(self._default), takes_self=True)
+    )
+    _address: Optional[str] = attr.ib(init=False, default=None)
 
     @property
     def name(self) -> str:
@@ -50,7 +53,7 @@ class IPField(Field):
 
     @property
     def size(self) -> int:
-        return 4 if self._address.version == 4 else 16
+        return len(self._packed)
 
     @property
     def default(self) -> str:
@@ -58,38 +61,46 @@ class IPField(Field):
 
     @property
     def value(self) -> str:
-        return f'{self._address}'
+        if self._address is None:
+            self._address = str(ipaddress.ip_address(self._packed))
+        return self._address
 
     @value.setter
     def value(self, value: str) -> None:
-        self._address = ipaddress.ip_address(value)
+        self._packed = pack_ip_address(value)
+        self._address = None
 
     @property
     def struct_format(self) -> str:
         # not really useful here
-        return '!I' if self._address.version == 4 else '!IIII'
+        return '!I' if len(self._packed) == 4 else '!IIII'
 
     def raw(self, packet: Packet = None) -> bytes:
-        return self._address.packed
+        return self._packed
 
     def random_value(self) -> str:
-        if self._address.version == 4:
-            return f'{random.randint(1, 192)}.{random.randint(1, 168)}.0.1'
-        else:
-            return f'fe80::{random.randint(1, 8)}'
+        # one draw of random bits formatted by the socket module is cheaper than building the address piece by piece
+        size = len(self._packed)
+        family = socket.AF_INET if size == 4 else socket.AF_INET6
+        return socket.inet_ntop(family, random.getrandbits(size * 8).to_bytes(size, 'big'))
 
     def compute_value(self, data: bytes, packet: Packet = None) -> bytes:
-        cursor = 4 if self._address.version == 4 else 16
+        cursor = len(self._packed)
         # if we don't have enough data to parse, we stop here
         if len(data) < cursor:
             return b''
-        self._address = ipaddress.ip_address(data[:cursor])
+        self._packed = bytes(data[:cursor])
+        self._address = None
         # important to know if this field was parsed correctly
         self._value_was_computed = True
         return data[cursor:]
 
     def __repr__(self):
-        return f'<{self.__class__.__name__}: default={self._default}, value={self._address}>'
+        return f'<{self.__class__.__name__}: default={self._default}, value={self.value}>'
+
+
+# maximum number of compression pointers followed when reading a domain name
+MAX_POINTER_HOPS = 16
 
 
 @attr.s(slots=True, repr=False)
@@ -108,6 +119,11 @@ class DomainNameField(Field):
     _raw_packet: bytes = attr.ib(default=b'', init=False)
     _pointer_labels: List[str] = attr.ib(factory=list, init=False)
     _pointer_value: int = attr.ib(default=0, init=False)
+    # the dotted form, struct format and size of the name are computed on first access after labels change
+    _value_cache: Optional[str] = attr.ib(default=None, init=False)
+    _struct_format_cache: Optional[str] = attr.ib(default=None, init=False)
+    _size_cache: Optional[int] = attr.ib(default=None, init=False)
+    _wire_labels_cache: Optional[bytes] = attr.ib(default=None, init=False)
 
     def __attrs_post_init__(self):
         self._default = self._default if self._default.endswith('.') else f'{self._default}.'
@@ -129,9 +145,15 @@ class DomainNameField(Field):
     def default(self) -> str:
         return self._default
 
+    @property
+    def pointer_value(self) -> int:
+        return self._pointer_value
+
     @property
     def value(self) -> str:
-        return '.'.join(label for label in [*self._labels, *self._pointer_labels]) + '.'
+        if self._value_cache is None:
+            self._value_cache = '.'.join(self._labels + self._pointer_labels) + '.'
+        return self._value_cache
 
     @value.setter
     def value(self, value: str) -> None:
@@ -140,90 +162,169 @@ class DomainNameField(Field):
             return
         value = value.rstrip('.')
         self._labels = value.split('.')
+        self._clear_caches()
+
+    def _clear_caches(self) -> None:
+        self._value_cache = None
+        self._struct_format_cache = None
+        self._size_cache = None
+        self._wire_labels_cache = None
 
     @property
     def struct_format(self) -> str:
-        result = f'{self._format}'
-        for label in self._labels:
-            result += f'B{len(label)}s'
+        if self._struct_format_cache is None:
+            result = f'{self._format}'
+            for label in self._labels:
+                result += f'B{len(label)}s'
 
-        if self._pointer_value:
-            result += 'H'
-        else:
-            result += 'B'
-        return result
+            if self._pointer_value:
+                result += 'H'
+            else:
+                result += 'B'
+            self._struct_format_cache = result
+        return self._struct_format_cache
 
     @property
     def size(self) -> int:
-        return struct.calcsize(self.struct_format)
+        if self._size_cache is None:
+            # each label is prefixed by its length, and the name ends with a null byte or a 2-bytes pointer
+            self._size_cache = sum(len(label) + 1 for label in self._labels) + (2 if self._pointer_value else 1)
+        return self._size_cache
+
+    def _get_wire_labels(self) -> bytes:
+        """Returns the length-prefixed labels of the name, without the null byte or pointer ending it."""
+        if self._wire_labels_cache is None:
+            if not self._labels:
+                self._wire_labels_cache = b''
+                return self._wire_labels_cache
+
+            # the name is encoded once, then each dot is replaced by the length of the label following it
+            wire_labels = bytearray(b'.' + '.'.join(self._labels).encode('ascii'))
+            index = 0
+            while index < len(wire_labels):
+                next_dot = wire_labels.find(b'.', index + 1)
+                if next_dot == -1:
+                    next_dot = len(wire_labels)
+                wire_labels[index] = next_dot - index - 1
+                index = next_dot
+            self._wire_labels_cache = bytes(wire_labels)
+        return self._wire_labels_cache
 
     def raw(self, packet: Packet = None) -> bytes:
-        parts = []
-        struct_format = f'{self._format}'
-        for label in self._labels:
-            length = len(label)
-            parts.extend([length, label.encode()])
-            struct_format += f'B{length}s'
+        data = bytearray()
+        self.write_into(data)
+        return bytes(data)
+
+    def write_into(self, out: bytearray, compression_table: Optional[Dict[str, int]] = None) -> None:
+        """
+        Appends the name in wire format to `out`, "www.example.com." is written as "3www7example3com0".
+
+        **Parameters:**
+
+        * **out:** The buffer holding the message being serialized.
+        * **compression_table:** An optional mapping of domain names already written in the message to their offset.
+        If given, the longest suffix already present in the message is replaced by a pointer as described in RFC 1035
+        section 4.1.4 and the table is updated with the suffixes written by this name.
+        """
+        # a parsed pointer must be kept as is
+        if self._pointer_value:
+            compression_table = None
+
+        wire_labels = self._get_wire_labels()
+        if compression_table is None:
+            out += wire_labels
+        else:
+            start = 0
+            for index in range(len(self._labels)):
+                # names are case-insensitive
+                suffix = '.'.join(self._labels[index:]).lower()
+                if suffix in compression_table:
+                    out += (0xC000 | compression_table[suffix]).to_bytes(2, 'big')
+                    return
+
+                # a pointer can only reference the first 16383 bytes of the message
+                if len(out) < 0x4000:
+                    compression_table[suffix] = len(out)
+                end = start + 1 + wire_labels[start]
+                out += wire_labels[start:end]
+                start = end
 
         if self._pointer_value:
-            struct_format += 'H'
-            parts.append(self._pointer_value)
+            out += self._pointer_value.to_bytes(2, 'big')
         else:
-            struct_format += 'B'
-            parts.append(0)
-        return struct.pack(struct_format, *parts)
+            out.append(0)
 
     @staticmethod
-    def _get_bin_value(value: int, size) -> str:
-        bin_value = bin(value)[2:]
-        if len(bin_value) < size * 8:
-            difference = size * 8 - len(bin_value)
-            bin_value = '0' * difference + bin_value
+    def _is_pointer(value: int) -> bool:
+        # a pointer starts with its two high bits set
+        return (value & 0xC0) == 0xC0
 
-        return bin_value
-
-    def _is_pointer(self, value: int) -> bool:
-        return '11' == self._get_bin_value(value, 1)[:2]
+    @staticmethod
+    def _get_length(data: memoryview, index: int) -> int:
+        # a crafted packet can end in the middle of a name, this must not escape as an IndexError
+        if index >= len(data):
+            raise ValueError('domain name label is truncated')
+        return data[index]
+
+    def _read_labels(self, data: memoryview, index: int) -> Tuple[List[str], int]:
+        """Returns labels found from index and the index of the null byte or pointer ending them."""
+        # labels are copied in one buffer in their presentation form, the length byte being replaced by a dot
+        name = bytearray()
+        length = self._get_length(data, index)
+        while length and not self._is_pointer(length):
+            end = index + 1 + length
+            if end > len(data):
+                raise ValueError('domain name label is truncated')
+            name += data[index + 1 : end]
+            name.append(0x2E)
+            index = end
+            length = self._get_length(data, index)
+
+        labels = name[:-1].decode('ascii').split('.') if name else []
+        return labels, index
 
-    def _get_pointer(self, value: int) -> int:
-        bin_value = self._get_bin_value(value, 2)
-        return int(bin_value[2:], 2)
+    @staticmethod
+    def _get_pointer(data: memoryview, index: int) -> int:
+        if index + 1 >= len(data):
+            raise ValueError('domain name pointer is truncated')
+        # the offset is given by the 14 bits following the two high bits of the pointer
+        return ((data[index] & 0x3F) << 8) | data[index + 1]
+
+    def _read_pointer_labels(self, pointer: int) -> List[str]:
+        raw_packet = memoryview(self._raw_packet)
+        labels: List[str] = []
+        visited = set()
+        # a pointer can lead to labels ending with another pointer, we protect ourselves against
+        # crafted packets with pointer loops or endless chains
+        while True:
+            if pointer in visited or len(visited) == MAX_POINTER_HOPS:
+                raise ValueError('domain name pointer chain is too deep or cyclic')
+            visited.add(pointer)
+            if pointer >= len(raw_packet):
+                raise ValueError('domain name pointer is out of the packet bounds')
+
+            pointer_labels, index = self._read_labels(raw_packet, pointer)
+            labels.extend(pointer_labels)
+            if not raw_packet[index]:
+                return labels
+            pointer = self._get_pointer(raw_packet, index)
 
     def compute_value(self, data: bytes, packet: Packet = None) -> bytes:
-        index = 0
-        labels: List[str] = []
+        view = memoryview(data)
+        labels, index = self._read_labels(view, 0)
         pointer_labels: List[str] = []
-        end_of_data = False
-
-        while not end_of_data:
-            length = data[index]
-            if self._is_pointer(length):
-                self._pointer_value = struct.unpack(f'{self._format}H', data[index : index + 2])[0]
-                pointer = self._get_pointer(self._pointer_value)
-                length = self._raw_packet[pointer]
-                # once we enter a pointer, we are sure that we can read labels to the end
-                while length:
-                    pointer += 1
-                    label = self._raw_packet[pointer : pointer + length]
-                    pointer_labels.append(label.decode())
-                    pointer += length
-                    length = self._raw_packet[pointer]
-                end_of_data = True
-            else:
-                index += 1
-                label = data[index : index + length]
-                labels.append(label.decode())
-                index += length
-                length = data[index]
-                if not length:
-                    index += 1
-                    end_of_data = True
 
-        self._labels = labels
-        self._pointer_labels = pointer_labels
-        if self._pointer_value:
+        if view[index]:
+            pointer = self._get_pointer(view, index)
+            self._pointer_value = 0xC000 | pointer
+            pointer_labels = self._read_pointer_labels(pointer)
             index += 2
+        else:
+            index += 1
 
+        self._labels = labels
+        self._pointer_labels = pointer_labels
+        self._clear_caches()
         self._value_was_computed = True
         return data[index:]
 
@@ -244,7 +345,11 @@ class TxtField(VariableStringField):
         return data[packet.rdlength :]
 
 
-class DNSTypes(enum.Enum):
+# types and classes are plain integers since they are only compared with values read on the wire,
+# enum fields get a dict of their names to pretty print them
+
+
+class DNSTypes:
     A = 1
     AAAA = 28
     CNAME = 5
@@ -254,7 +359,7 @@ class DNSTypes(enum.Enum):
     PTR = 12
 
 
-class DNSClasses(enum.Enum):
+class DNSClasses:
     IN = 1
     CS = 2
     CH = 3
@@ -262,53 +367,170 @@ class DNSClasses(enum.Enum):
     ANY = 255
 
 
+def get_names(constants: type) -> Dict[int, str]:
+    """Returns a mapping of the integer constants of a class to their names."""
+    return {value: name for name, value in vars(constants).items() if isinstance(value, int)}
+
+
+DNS_TYPE_NAMES = get_names(DNSTypes)
+DNS_CLASS_NAMES = get_names(DNSClasses)
+
+
+def type_is(record_type: int) -> Callable[[Packet], bool]:
+    """Returns a condition checking the type of a resource record."""
+    return lambda packet: packet.type == record_type
+
+
+class DNSRecord(Packet):
+    """Base class of questions and resource records which both start with a domain name."""
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_record_plan(cls) -> List[Tuple[str, bool]]:
+        """Returns the name of each field and whether it holds a domain name, computed once per class."""
+        plan = []
+        for field in cls.__fields__:
+            # noinspection PyProtectedMember
+            inner_field = field._field if isinstance(field, ConditionalField) else field
+            plan.append((field.name, isinstance(inner_field, DomainNameField)))
+        return plan
+
+    @classmethod
+    def from_bytes(cls, data: bytes, raw_packet: bytes = b'') -> Packet:
+        return cls.parse(data, raw_packet)[0]
+
+    @classmethod
+    def parse(cls, data: bytes, raw_packet: bytes = b'') -> Tuple[Packet, int]:
+        """
+        Creates a record from bytes and returns it with the number of bytes it took in `data`.
+
+        **Parameters:**
+
+        * **data:** The raw bytes starting with the record.
+        * **raw_packet:** The whole DNS message, used to follow compression pointers.
+        """
+        packet = cls()
+        length = len(data)
+        for field, (name, holds_domain_name) in zip(packet._fields, cls._get_record_plan()):
+            if holds_domain_name:
+                # noinspection PyProtectedMember
+                name_field = field._field if isinstance(field, ConditionalField) else field
+                name_field.raw_packet = raw_packet
+            data = field.compute_value(data, packet)
+            # the field already holds its value, so we bypass Packet.__setattr__ which would set it again
+            object.__setattr__(packet, name, field.value)
+
+        return packet, length - len(data)
+
+    @property
+    def has_pointer(self) -> bool:
+        """Returns True if one of the record domain names was parsed with a compression pointer."""
+        for field in self._fields:
+            # noinspection PyProtectedMember
+            name_field = field._field if isinstance(field, ConditionalField) else field
+            if isinstance(name_field, DomainNameField) and name_field.pointer_value:
+                return True
+        return False
+
+    def write_into(self, out: bytearray, compression_table: Optional[Dict[str, int]] = None) -> None:
+        """
+        Appends bytes of the record to `out`.
+
+        **Parameters:**
+
+        * **out:** The buffer holding the message being serialized.
+        * **compression_table:** An optional mapping of domain names already written in the message to their offset,
+        used to compress the owner name.
+        """
+        for field in self._fields:
+            # names in rdata are not compressed because rdlength would have to be recomputed
+            if isinstance(field, DomainNameField):
+                field.write_into(out, compression_table)
+            else:
+                out += field.raw(self)
+
+
+# type, rrclass, ttl and rdlength which follow the name of a resource record
+RR_FIXED = struct.Struct('!HHIH')
+# name of the field holding the rdata of each record type
+RDATA_FIELDS = {
+    DNSTypes.A: 'a',
+    DNSTypes.AAAA: 'aaaa',
+    DNSTypes.CNAME: 'cname',
+    DNSTypes.NS: 'ns',
+    DNSTypes.PTR: 'ptr',
+    DNSTypes.TXT: 'txt',
+    DNSTypes.SPF: 'spf',
+}
+
+
 # noinspection PyArgumentList
-class ResourceRecord(Packet):
+class ResourceRecord(DNSRecord):
     __fields__ = [
         DomainNameField('kifurushi.rtd.io'),
-        ShortEnumField('type', 1, DNSTypes),
-        ShortEnumField('rrclass', 1, DNSClasses),
+        ShortEnumField('type', 1, DNS_TYPE_NAMES),
+        ShortEnumField('rrclass', 1, DNS_CLASS_NAMES),
         IntField('ttl', 0),
         ShortField('rdlength', 0),
-        ConditionalField(IPField('a', '127.0.0.1'), lambda p: p.type == DNSTypes.A.value),
-        ConditionalField(IPField('aaaa', '::1'), lambda p: p.type == DNSTypes.AAAA.value),
-        ConditionalField(DomainNameField('kifurushi.io', 'cname'), lambda p: p.type == DNSTypes.CNAME.value),
-        ConditionalField(DomainNameField('kifurushi.io', 'ns'), lambda p: p.type == DNSTypes.NS.value),
-        ConditionalField(DomainNameField('1.0.0.127.in-addr.arpa', 'ptr'), lambda p: p.type == DNSTypes.PTR.value),
-        ConditionalField(TxtField('txt', 'kifurushi', decode=True), lambda p: p.type == DNSTypes.TXT.value),
-        ConditionalField(TxtField('spf', 'kifurushi', decode=True), lambda p: p.type == DNSTypes.SPF.value),
+        ConditionalField(IPField('a', '127.0.0.1'), type_is(DNSTypes.A)),
+        ConditionalField(IPField('aaaa', '::1'), type_is(DNSTypes.AAAA)),
+        ConditionalField(DomainNameField('kifurushi.io', 'cname'), type_is(DNSTypes.CNAME)),
+        ConditionalField(DomainNameField('kifurushi.io', 'ns'), type_is(DNSTypes.NS)),
+        ConditionalField(DomainNameField('1.0.0.127.in-addr.arpa', 'ptr'), type_is(DNSTypes.PTR)),
+        ConditionalField(TxtField('txt', 'kifurushi', decode=True), type_is(DNSTypes.TXT)),
+        ConditionalField(TxtField('spf', 'kifurushi', decode=True), type_is(DNSTypes.SPF)),
     ]
 
     @classmethod
-    def from_bytes(cls, data: bytes, raw_packet: bytes = b'') -> Packet:
+    def parse(cls, data: bytes, raw_packet: bytes = b'') -> Tuple[Packet, int]:
         packet = cls()
-        for field in packet._fields:
-            if isinstance(field, DomainNameField):
-                field.raw_packet = raw_packet
-            data = field.compute_value(data, packet)
-            cls._set_packet_attribute(field, packet)
+        length = len(data)
+        name_field, *fixed_fields = packet._fields[:5]
+        name_field.raw_packet = raw_packet
+        data = name_field.compute_value(data, packet)
+        object.__setattr__(packet, name_field.name, name_field.value)
+        # if we don't have enough data to parse, we stop here
+        if len(data) < RR_FIXED.size:
+            return packet, length - len(data)
+
+        # the fixed part of the record is unpacked in one call
+        for field, value in zip(fixed_fields, RR_FIXED.unpack_from(data)):
+            field.value = value
+            field._value_was_computed = True
+            object.__setattr__(packet, field.name, value)
+        data = data[RR_FIXED.size :]
+
+        # only the rdata field matching the record type is parsed, other conditions are false anyway
+        rdata_name = RDATA_FIELDS.get(packet.type)
+        if rdata_name is not None:
+            rdata_field = packet._field_mapping[rdata_name]
+            # noinspection PyProtectedMember
+            if isinstance(rdata_field._field, DomainNameField):
+                rdata_field._field.raw_packet = raw_packet
+            data = rdata_field.compute_value(data, packet)
+            object.__setattr__(packet, rdata_name, rdata_field.value)
+        else:
+            # we don't know how to parse this rdata, but rdlength tells us how many bytes to skip
+            data = data[packet.rdlength :]
 
-        return packet
+        return packet, length - len(data)
 
 
 # noinspection PyArgumentList
-class Question(Packet):
+class Question(DNSRecord):
     __fields__ = [
         DomainNameField('kifurushi.io', 'qname'),
-        ShortEnumField('qtype', 1, DNSTypes),
-        ShortEnumField('qclass', 1, DNSClasses),
+        ShortEnumField('qtype', 1, DNS_TYPE_NAMES),
+        ShortEnumField('qclass', 1, DNS_CLASS_NAMES),
     ]
 
-    @classmethod
-    def from_bytes(cls, data: bytes, raw_packet: bytes = b'') -> Packet:
-        packet = cls()
-        for field in packet._fields:
-            if isinstance(field, DomainNameField):
-                field.raw_packet = raw_packet
-            data = field.compute_value(data, packet)
-            cls._set_packet_attribute(field, packet)
 
-        return packet
+# the DNS header is always 12 bytes long: id, flags, qdcount, ancount, nscount and arcount
+DNS_HEADER = struct.Struct('!HHHHHH')
+
+
+# keyword arguments of DNS holding records instead of field values
+RECORD_ITEMS = ('questions', 'answers', 'authority_answers', 'additional_answers')
 
 
 # noinspection PyArgumentList
@@ -336,22 +558,26 @@ class DNS(Packet):
         ShortField('arcount', 0),
     ]
 
+    # empty records are shared by all instances, so messages without records don't allocate them
+    questions: Sequence[Question] = ()
+    answers: Sequence[ResourceRecord] = ()
+    authority_answers: Sequence[ResourceRecord] = ()
+    additional_answers: Sequence[ResourceRecord] = ()
+
     def __init__(self, **kwargs):
-        self._field_mapping = []  # if we don't do this, we have an issue when trying to instantiate self.questions
-        self.questions: List[Question] = []
-        self.answers: List[ResourceRecord] = []
-        self.authority_answers: List[ResourceRecord] = []
-        self.additional_answers: List[ResourceRecord] = []
-        self._init_questions(kwargs)
-        self._init_answers(kwargs)
+        # records are not fields, so we take them out of kwargs before initializing the packet
+        records = {item: kwargs.pop(item) for item in list(kwargs) if item in RECORD_ITEMS}
         super().__init__(**kwargs)
+        self._init_questions(records)
+        self._init_answers(records)
 
     def _init_questions(self, kwargs: Dict[str, Any]) -> None:
         questions = kwargs.pop('questions', None)
         if questions is None:
             return
 
-        if not all(isinstance(question, Question) for question in questions):
+        # the exact type check is cheaper and matches most of the time, isinstance is only kept for subclasses
+        if not all(type(question) is Question or isinstance(question, Question) for question in questions):
             raise TypeError('questions must be a list of Question objects')
 
         self.questions = questions
@@ -362,34 +588,60 @@ class DNS(Packet):
             if answers is None:
                 continue
 
-            if not all(isinstance(answer, ResourceRecord) for answer in answers):
+            if not all(type(answer) is ResourceRecord or isinstance(answer, ResourceRecord) for answer in answers):
                 raise TypeError(f'{item} must be a list of ResourceRecord objects')
 
             setattr(self, item, answers)
 
+    @property
+    def _flags(self) -> int:
+        return (
+            (self.qr << 15)
+            | (self.opcode << 11)
+            | (self.aa << 10)
+            | (self.tc << 9)
+            | (self.rd << 8)
+            | (self.ra << 7)
+            | (self.z << 6)
+            | (self.ac << 5)
+            | (self.cd << 4)
+            | self.rcode
+        )
+
     @property
     def raw(self) -> bytes:
-        data = b''.join(field.raw(self) for field in self._fields)
-        data += b''.join(question.raw for question in self.questions)
-        data += b''.join(answer.raw for answer in [*self.answers, *self.authority_answers, *self.additional_answers])
+        # the header layout is fixed, so we pack it in one call instead of serializing each field
+        out = bytearray(DNS_HEADER.size)
+        DNS_HEADER.pack_into(out, 0, self.id, self._flags, self.qdcount, self.ancount, self.nscount, self.arcount)
+        records = [*self.questions, *self.answers, *self.authority_answers, *self.additional_answers]
+        # parsed pointers refer to offsets of the original message, so its layout must be kept as is
+        compression_table = None if any(record.has_pointer for record in records) else {}
+        for record in records:
+            record.write_into(out, compression_table)
 
-        return data
+        return bytes(out)
 
     @classmethod
     def from_bytes(cls, data: bytes) -> 'DNS':
         packet = cls()
         cloned_data = (data + b'.')[:-1]
-
-        for field in packet._fields:
-            data = field.compute_value(data, packet)
+        # if we don't have enough data to parse the header, we stop here
+        if len(data) < DNS_HEADER.size:
+            return packet
+
+        identifier, flags, qdcount, ancount, nscount, arcount = DNS_HEADER.unpack_from(data)
+        for field, value in zip(packet._fields, (identifier, flags, qdcount, ancount, nscount, arcount)):
+            field.value = value
+            field._value_was_computed = True
             cls._set_packet_attribute(field, packet)
+        data = data[DNS_HEADER.size :]
 
         cursor = 0
         # questions
         questions = []
         for _ in range(packet.qdcount):
-            question = Question.from_bytes(data[cursor:], cloned_data)
-            cursor += len(question.raw)
+            question, consumed = Question.parse(data[cursor:], cloned_data)
+            cursor += consumed
             questions.append(question)
         packet.questions = questions
 
@@ -401,8 +653,8 @@ class DNS(Packet):
         ]:
             answers = []
             for _ in range(getattr(packet, count)):
-                answer = ResourceRecord.from_bytes(data[cursor:], cloned_data)
-                cursor += len(answer.raw)
+                answer, consumed = ResourceRecord.parse(data[cursor:], cloned_data)
+                cursor += consumed
                 answers.append(answer)
             setattr(packet, item, answers)
 
@@ -411,26 +663,31 @@ class DNS(Packet):
 
 if __name__ == '__main__':
     CLOUDFARE = '1.1.1.1'
-    domain = 'openclassrooms.com'
-    questions = [
-        Question(qname=domain, qtype=DNSTypes.A.value),
-    ]
-    dns = DNS(questions=questions, qdcount=len(questions), rd=1)
+    domains = ['openclassrooms.com', 'python.org', 'github.com']
 
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
         sock.settimeout(2)
-        print(f'sending dns A queries to cloudfare for domain {domain}')
-        sock.sendto(dns.raw, (CLOUDFARE, 53))
+        # a bigger receive buffer avoids dropping responses arriving while we are still sending queries
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        print(f'sending dns A queries to cloudfare for domains {", ".join(domains)}')
+        # all queries go through the same socket, responses are matched with their query using the dns id
+        pending_queries = {}
+        for identifier, domain in enumerate(domains, start=1):
+            questions = [
+                Question(qname=domain, qtype=DNSTypes.A),
+            ]
+            dns = DNS(id=identifier, questions=questions, qdcount=len(questions), rd=1)
+            pending_queries[identifier] = domain
+            sock.sendto(dns.raw, (CLOUDFARE, 53))
 
-        answers = []
-        truncated = True
-        while truncated:
+        print('== responses from cloudfare ==')
+        while pending_queries:
             data, _ = sock.recvfrom(1024)
             dns = DNS.from_bytes(data)
-            answers.extend([*dns.answers, *dns.authority_answers, *dns.additional_answers])
-
-            truncated = False if dns.tc == 0 else True
+            domain = pending_queries.pop(dns.id, None)
+            if domain is None:
+                continue
 
-        print('== responses from cloudfare ==')
-        for answer in answers:
-            print(answer)
+            print(f'{domain}:' if dns.tc == 0 else f'{domain} (truncated response):')
+            for answer in [*dns.answers, *dns.authority_answers, *dns.additional_answers]:
+                print(answer)
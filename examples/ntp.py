@@ -31,19 +31,23 @@ modes = {
     7: 'reserved for private use',
 }
 
+# an NTP timestamp is a 32 bits count of seconds followed by a 32 bits count of fractions of a second
+NTP_TIMESTAMP = struct.Struct('!II')
+# multiplying by the inverse of 2**32 is cheaper than dividing each fraction
+FRACTION_SCALE = 1.0 / 2**32
+# NTP timestamps count seconds since January 1, 1900 (ignoring leap seconds)
+NTP_EPOCH = datetime(1900, 1, 1)
+
 
 def extract_datetime(transmit_timestamp: bytes) -> datetime:
     # The timestamp is stored in the "NTP timestamp format", which is a 32
     # byte count of whole seconds, followed by a 32 byte count of fractions of
     # a second. See: https://tools.ietf.org/html/rfc5905#page-13
-    seconds, fraction = struct.unpack('!II', transmit_timestamp)
+    seconds, fraction = NTP_TIMESTAMP.unpack(transmit_timestamp)
 
-    # The timestamp is the number of seconds since January 1, 1900 (ignoring
-    # leap seconds). To convert it to a datetime object, we do some simple
-    # datetime arithmetic:
-    base_time = datetime(1900, 1, 1)
-    offset = timedelta(seconds=seconds + fraction / 2**32)
-    return base_time + offset
+    # The timestamp is the number of seconds since the NTP epoch. To convert it
+    # to a datetime object, we do some simple datetime arithmetic:
+    return NTP_EPOCH + timedelta(seconds=seconds + fraction * FRACTION_SCALE)
 
 
 # noinspection PyArgumentList
@@ -87,6 +91,7 @@ if __name__ == '__main__':
             data, address = sock.recvfrom(1024)
             print('got response from:', address)
             ntp = NTP.from_bytes(data)
-            clock = extract_datetime(ntp.fields[-1].raw())
+            # the packet attribute already holds the parsed value, there is no need to clone all fields to get it
+            clock = extract_datetime(ntp.transmit_timestamp.to_bytes(8, 'big'))
             print('Their clock read (in UTC):', clock)
             current_time = time.time()
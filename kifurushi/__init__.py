@@ -1,63 +1,147 @@
-from .abc import CommonField, Field, VariableStringField
-from .fields import (
-    BitsField,
-    ByteBitsField,
-    ByteEnumField,
-    ByteField,
-    ConditionalField,
-    EnumMixin,
-    FieldPart,
-    FixedStringField,
-    HexMixin,
-    IntBitsField,
-    IntEnumField,
-    IntField,
-    LongBitsField,
-    LongEnumField,
-    LongField,
-    NumericField,
-    ShortBitsField,
-    ShortEnumField,
-    ShortField,
-    SignedByteEnumField,
-    SignedByteField,
-    SignedIntEnumField,
-    SignedIntField,
-    SignedLongEnumField,
-    SignedLongField,
-    SignedShortEnumField,
-    SignedShortField,
-)
-from .packet import Packet, create_packet_class, extract_layers
-from .utils.network import checksum, hexdump
-from .utils.random_values import (
-    LEFT_BYTE,
-    LEFT_INT,
-    LEFT_LONG,
-    LEFT_SHORT,
-    LEFT_SIGNED_BYTE,
-    LEFT_SIGNED_INT,
-    LEFT_SIGNED_LONG,
-    LEFT_SIGNED_SHORT,
-    RIGHT_BYTE,
-    RIGHT_INT,
-    RIGHT_LONG,
-    RIGHT_SHORT,
-    RIGHT_SIGNED_BYTE,
-    RIGHT_SIGNED_INT,
-    RIGHT_SIGNED_LONG,
-    RIGHT_SIGNED_SHORT,
-    rand_bytes,
-    rand_int,
-    rand_long,
-    rand_short,
-    rand_signed_bytes,
-    rand_signed_int,
-    rand_signed_long,
-    rand_signed_short,
-    rand_string,
-)
+"""
+Objects of the package are imported lazily: a submodule is only imported when one of its objects is requested, so
+`from kifurushi import checksum` does not pay for the import of the fields and packet modules.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
+if TYPE_CHECKING:
+    # type checkers and IDEs don't run __getattr__, so they get the public objects from these imports
+    from .abc import CommonField, Field, VariableStringField
+    from .fields import (
+        BitsField,
+        ByteBitsField,
+        ByteEnumField,
+        ByteField,
+        ConditionalField,
+        EnumMixin,
+        FieldPart,
+        FixedStringField,
+        HexMixin,
+        IntBitsField,
+        IntEnumField,
+        IntField,
+        LongBitsField,
+        LongEnumField,
+        LongField,
+        NumericField,
+        ShortBitsField,
+        ShortEnumField,
+        ShortField,
+        SignedByteEnumField,
+        SignedByteField,
+        SignedIntEnumField,
+        SignedIntField,
+        SignedLongEnumField,
+        SignedLongField,
+        SignedShortEnumField,
+        SignedShortField,
+        hex_attribute,
+    )
+    from .packet import Packet, create_packet_class, extract_layers
+    from .utils.network import checksum, hexdump
+    from .utils.random_values import (
+        LEFT_BYTE,
+        LEFT_INT,
+        LEFT_LONG,
+        LEFT_SHORT,
+        LEFT_SIGNED_BYTE,
+        LEFT_SIGNED_INT,
+        LEFT_SIGNED_LONG,
+        LEFT_SIGNED_SHORT,
+        RIGHT_BYTE,
+        RIGHT_INT,
+        RIGHT_LONG,
+        RIGHT_SHORT,
+        RIGHT_SIGNED_BYTE,
+        RIGHT_SIGNED_INT,
+        RIGHT_SIGNED_LONG,
+        RIGHT_SIGNED_SHORT,
+        rand_bytes,
+        rand_int,
+        rand_long,
+        rand_short,
+        rand_signed_bytes,
+        rand_signed_int,
+        rand_signed_long,
+        rand_signed_short,
+        rand_string,
+    )
+
+# maps each public object to the submodule defining it
+_object_modules = {
+    **dict.fromkeys(['Field', 'CommonField', 'VariableStringField'], '.abc'),
+    **dict.fromkeys(
+        [
+            'NumericField',
+            'ByteField',
+            'SignedByteField',
+            'ShortField',
+            'SignedShortField',
+            'IntField',
+            'SignedIntField',
+            'LongField',
+            'SignedLongField',
+            'ByteEnumField',
+            'SignedByteEnumField',
+            'ShortEnumField',
+            'SignedShortEnumField',
+            'IntEnumField',
+            'SignedIntEnumField',
+            'LongEnumField',
+            'SignedLongEnumField',
+            'FixedStringField',
+            'FieldPart',
+            'BitsField',
+            'ByteBitsField',
+            'ShortBitsField',
+            'IntBitsField',
+            'LongBitsField',
+            'ConditionalField',
+            'HexMixin',
+            'EnumMixin',
+            'hex_attribute',
+        ],
+        '.fields',
+    ),
+    **dict.fromkeys(
+        [
+            'rand_short',
+            'rand_string',
+            'rand_bytes',
+            'rand_long',
+            'rand_int',
+            'rand_signed_bytes',
+            'rand_signed_short',
+            'rand_signed_long',
+            'rand_signed_int',
+            'LEFT_LONG',
+            'LEFT_BYTE',
+            'LEFT_SIGNED_LONG',
+            'LEFT_SIGNED_BYTE',
+            'LEFT_INT',
+            'LEFT_SIGNED_INT',
+            'LEFT_SHORT',
+            'LEFT_SIGNED_SHORT',
+            'RIGHT_SHORT',
+            'RIGHT_SIGNED_SHORT',
+            'RIGHT_INT',
+            'RIGHT_BYTE',
+            'RIGHT_LONG',
+            'RIGHT_SIGNED_BYTE',
+            'RIGHT_SIGNED_LONG',
+            'RIGHT_SIGNED_INT',
+        ],
+        '.utils.random_values',
+    ),
+    **dict.fromkeys(['hexdump', 'checksum'], '.utils.network'),
+    **dict.fromkeys(['Packet', 'extract_layers', 'create_packet_class'], '.packet'),
+}
+
+# submodules which were available as package attributes when the package imported them
+_submodules = frozenset(['abc', 'fields', 'packet', 'utils'])
+
+# listed explicitly, so that type checkers know the objects exported by the package
 __all__ = [
     # abc
     'Field',
@@ -91,6 +175,7 @@ __all__ = [
     'ConditionalField',
     'HexMixin',
     'EnumMixin',
+    'hex_attribute',
     # utils.random_values
     'rand_short',
     'rand_string',
@@ -125,3 +210,20 @@ __all__ = [
     'extract_layers',
     'create_packet_class',
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _submodules:
+        value = importlib.import_module(f'.{name}', __name__)
+    elif name in _object_modules:
+        value = getattr(importlib.import_module(_object_modules[name], __name__), name)
+    else:
+        raise AttributeError(f'module {__name__} has no attribute {name}')
+
+    # the object is stored in the module namespace, so next lookups don't go through this function
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *__all__])
@@ -1,9 +1,13 @@
 """Module which contains base abstract classes"""
 import copy
+import functools
+import operator
+import re
 import string
 import struct
+import sys
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, AnyStr, Optional, Union
+from typing import TYPE_CHECKING, Any, AnyStr, Callable, Optional, Tuple, Union
 
 import attr
 
@@ -23,7 +27,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from .packet import Packet
 
 
-@attr.s(repr=False)
+@attr.s(slots=True, repr=False, getstate_setstate=False)
 class Field(ABC):
     """The abstract base class that **all** fields **must** inherit."""
 
@@ -78,6 +82,9 @@ class Field(ABC):
         """Returns a copy of the field."""
         return copy.copy(self)
 
+    def __copy__(self) -> 'Field':
+        return shallow_copy(self)
+
     @abstractmethod
     def compute_value(self, data: bytes, packet: 'Packet' = None) -> bytes:
         """
@@ -90,27 +97,140 @@ class Field(ABC):
         when the value of the current field depends on other fields.
         """
 
+    def compute_value_at(self, data: bytes, offset: int, packet: 'Packet' = None) -> int:
+        """
+        Computes the field value from the raw bytes starting at `offset` and returns the offset of the next byte
+        to parse. If there is not enough data to compute the value, the length of `data` is returned.
+
+        The default implementation calls `compute_value` with the remaining bytes, fields can override it to parse
+        `data` without copying them.
+
+        **Parameters:**
+
+        * **data:**: The raw data currently being parsed by a packet object.
+        * **offset:** The position of the first byte of the field in `data`.
+        * **packet:** The optional packet currently parsing the raw `data` bytes. It can be useful
+        when the value of the current field depends on other fields.
+        """
+        remaining_data = self.compute_value(data[offset:] if offset else data, packet)
+        return len(data) - len(remaining_data)
+
     @abstractmethod
     def __repr__(self):  # pragma: no cover
         pass
 
 
+@functools.lru_cache(maxsize=None)
+def get_struct(struct_format: str) -> struct.Struct:
+    """
+    Returns a compiled struct object for the given format. The object is shared by all fields using the same format.
+
+    **Parameters:**
+
+    * **struct_format:** The struct format including the byte order.
+    """
+    return struct.Struct(struct_format)
+
+
+@functools.lru_cache(maxsize=None)
+def get_slots(cls: type) -> Tuple[Tuple[str, ...], Callable[[Any], Tuple[Any, ...]]]:
+    """
+    Returns the names of the slots defined by a class and its parents, and a function reading their values
+    on an instance of the class.
+
+    **Parameters:**
+
+    * **cls:** The class to inspect.
+    """
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ('__dict__', '__weakref__') and name not in names:
+                names.append(name)
+
+    if len(names) == 1:
+        getter = operator.attrgetter(names[0])
+        return tuple(names), lambda obj: (getter(obj),)
+    return tuple(names), operator.attrgetter(*names) if names else lambda obj: ()
+
+
+def shallow_copy(obj: Any) -> Any:
+    """
+    Returns a shallow copy of an object by copying its slots and instance dict. It is faster than the generic
+    protocol used by `copy.copy`.
+
+    **Parameters:**
+
+    * **obj:** The object to copy.
+    """
+    cls = obj.__class__
+    new_object = cls.__new__(cls)
+    names, get_values = get_slots(cls)
+    try:
+        values = get_values(obj)
+    except AttributeError:
+        # some slots are not set, only the ones having a value are copied
+        names = [name for name in names if hasattr(obj, name)]
+        values = [getattr(obj, name) for name in names]
+
+    for name, value in zip(names, values):
+        setattr(new_object, name, value)
+
+    instance_dict = getattr(obj, '__dict__', None)
+    if instance_dict:
+        new_object.__dict__.update(instance_dict)
+    return new_object
+
+
+# random value generator of each numeric struct format
+RANDOM_FUNCTIONS = {
+    'b': rand_signed_bytes,
+    'B': rand_bytes,
+    'h': rand_signed_short,
+    'H': rand_short,
+    'i': rand_signed_int,
+    'I': rand_int,
+    'q': rand_signed_long,
+    'Q': rand_long,
+}
+
+
+# punctuation characters not allowed in a field name
+PUNCTUATION_REGEX = re.compile(f"[{re.escape(string.punctuation.replace('_', ''))}]")
+
+
+def intern_name(name: Any) -> Any:
+    """Interns a field name so that it shares the same string object as packet attribute names."""
+    # other types are rejected by the name validators
+    return sys.intern(name) if isinstance(name, str) else name
+
+
 def name_validator(field: Field, _, name: str) -> None:
-    message = (
-        f'{field.__class__.__name__} name must starts with a letter and follow standard rules for declaring'
-        f' a variable in python but you provided {name}'
-    )
-    punctuation = string.punctuation.replace('_', '')
-    if not name[0].isalpha() or not name[-1].isalnum():
-        raise ValueError(message)
+    if not name[0].isalpha() or not name[-1].isalnum() or PUNCTUATION_REGEX.search(name):
+        raise ValueError(
+            f'{field.__class__.__name__} name must starts with a letter and follow standard rules for declaring'
+            f' a variable in python but you provided {name}'
+        )
 
-    for character in punctuation:
-        if character in name:
-            raise ValueError(message)
+
+# byte orders accepted by the struct module
+BYTE_ORDERS = frozenset('<>!@=')
+# struct formats of numeric fields, string fields use a length followed by "s"
+NUMERIC_FORMATS = frozenset('bBhHiIqQ')
+STRING_FORMAT_REGEX = re.compile(r'\d+s')
+
+
+def format_validator(field: Field, _, struct_format: str) -> None:
+    if struct_format not in NUMERIC_FORMATS and STRING_FORMAT_REGEX.fullmatch(struct_format) is None:
+        raise ValueError(
+            f'{field.__class__.__name__} format must be one of b, B, h, H, i, I, q, Q or a length followed by s'
+            f' but you provided {struct_format}'
+        )
 
 
 # noinspection PyAbstractClass
-@attr.s(repr=False)
+@attr.s(slots=True, repr=False, getstate_setstate=False)
 class CommonField(Field):
     r"""
     A common interface for integer and fixed-size string fields.
@@ -126,22 +246,21 @@ class CommonField(Field):
     `"!"`, `"<"` (little-endian), `">"` (big-endian), `"@"` (native), `"="` (standard).
     """
 
-    _name: str = attr.ib(validator=[attr.validators.instance_of(str), name_validator])
+    _name: str = attr.ib(converter=intern_name, validator=[attr.validators.instance_of(str), name_validator])
     _default: Any = attr.ib()
     _value: Any = attr.ib(init=False)
     _format: str = attr.ib(
         kw_only=True,
-        validator=[attr.validators.instance_of(str), attr.validators.matches_re(r'b|B|h|h|H|i|I|q|Q|\d+s')],
+        validator=[attr.validators.instance_of(str), format_validator],
     )
     _size: int = attr.ib(init=False)
     _struct: struct.Struct = attr.ib(init=False)
-    _order: str = attr.ib(kw_only=True, default='!', validator=attr.validators.in_(['<', '>', '!', '@', '=']))
+    _order: str = attr.ib(kw_only=True, default='!', validator=attr.validators.in_(BYTE_ORDERS))
 
     def __attrs_post_init__(self):
-        _format = f'{self._order}{self._format}'
         self._value = self._default
-        self._struct = struct.Struct(_format)
-        self._size = struct.calcsize(_format)
+        self._struct = get_struct(f'{self._order}{self._format}')
+        self._size = self._struct.size
 
     @property
     def size(self) -> int:
@@ -161,7 +280,7 @@ class CommonField(Field):
     @property
     def struct_format(self) -> str:
         """Returns the struct format used under the hood for computation of field value."""
-        return f'{self._order}{self._format}'
+        return self._struct.format
 
     @property
     def value(self) -> Union[int, str]:
@@ -171,36 +290,17 @@ class CommonField(Field):
     @value.setter
     def value(self, value: Any) -> None:
         """Sets field's value."""
+        attribute = attr.fields(self.__class__)._value
+        if attribute.validator is not None:
+            attribute.validator(self, attribute, value)
         self._value = value
-        attr.validate(self)
 
     def random_value(self) -> Union[int, str]:
         """Returns a valid random value according to the field format."""
-        if self._format == 'b':
-            return rand_signed_bytes()
-
-        elif self._format == 'B':
-            return rand_bytes()
-
-        elif self._format == 'h':
-            return rand_signed_short()
-
-        elif self._format == 'H':
-            return rand_short()
-
-        elif self._format == 'i':
-            return rand_signed_int()
-
-        elif self._format == 'I':
-            return rand_int()
-
-        elif self._format == 'q':
-            return rand_signed_long()
-
-        elif self._format == 'Q':
-            return rand_long()
-        else:
-            return rand_string(int(self._format[:-1]))
+        random_function = RANDOM_FUNCTIONS.get(self._format)
+        if random_function is not None:
+            return random_function()
+        return rand_string(int(self._format[:-1]))
 
     def __repr__(self):
         return f'<{self.__class__.__name__}: name={self._name}, value={self._value}, default={self._default}>'
@@ -235,15 +335,18 @@ class VariableStringField(Field):
     Defaults to `False` meaning it is bytes which is considered by default.
     """
 
-    _name: str = attr.ib(validator=[attr.validators.instance_of(str), name_validator])
+    _name: str = attr.ib(converter=intern_name, validator=[attr.validators.instance_of(str), name_validator])
     # decode must come before default, look at default "default" factory method to see the relation.
     _decode: bool = attr.ib(default=False, kw_only=True, validator=attr.validators.instance_of(bool))
     _default: AnyStr = attr.ib(validator=attr.validators.instance_of((str, bytes, bytearray)))
     _max_length: Optional[int] = attr.ib(
         default=None, validator=attr.validators.optional(attr.validators.instance_of(int))
     )
-    _order: str = attr.ib(default='!', validator=attr.validators.in_(['<', '>', '!', '@', '=']))
+    _order: str = attr.ib(default='!', validator=attr.validators.in_(BYTE_ORDERS))
     _value: AnyStr = attr.ib(init=False)
+    # utf-8 encoding of the last string value returned by raw and that string, to avoid encoding it again
+    _encoded: Optional[bytes] = attr.ib(init=False, default=None, eq=False)
+    _encoded_value: Optional[str] = attr.ib(init=False, default=None, eq=False)
 
     def __attrs_post_init__(self):
         if self._max_length is not None and len(self._default) > self._max_length:
@@ -307,7 +410,11 @@ class VariableStringField(Field):
         when the computation of the field value depends on other fields.
         """
         if self._decode:
-            return self._value.encode()
+            # compute_value implementations set the value directly, so the cache is checked against the value
+            if self._encoded_value is not self._value:
+                self._encoded = self._value.encode()
+                self._encoded_value = self._value
+            return self._encoded
         return bytes(self._value)
 
     def __repr__(self):
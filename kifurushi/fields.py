@@ -1,6 +1,7 @@
 # ruff: noqa: S311, C901
 """This module contains field implementations."""
 import enum
+import functools
 import inspect
 import random
 import struct
@@ -28,51 +29,51 @@ from kifurushi.utils.random_values import (
     RIGHT_SIGNED_SHORT,
 )
 
-from .abc import CommonField, Field, name_validator
+from .abc import BYTE_ORDERS, CommonField, Field, get_struct, intern_name, name_validator, shallow_copy
 
 if TYPE_CHECKING:  # pragma: no cover
     from .packet import Packet
 
 
-def check_boundaries(left: int, right: int, value: int, message: str) -> None:
-    if not left <= value <= right:
-        raise ValueError(message)
+def check_numeric_value(field: CommonField, attribute_name: str, value: int) -> None:
+    if not isinstance(value, int):
+        raise TypeError(f'{field.name} {attribute_name} must be an integer but you provided {value!r}')
+
+    bounds = field._bounds
+    if bounds is not None and not bounds[0] <= value <= bounds[1]:
+        raise ValueError(f'{field.name} {attribute_name} must be between {bounds[0]} and {bounds[1]}')
 
 
 def numeric_validator(field: CommonField, attribute: attr.Attribute, value: int) -> None:
-    attribute_name = attribute.name if attribute.name[0] != '_' else attribute.name[1:]
-    message = '{name} {attribute_name} must be between {left} and {right}'
-    class_name = field.__class__.__name__
-    for name, left, right in [
-        ('ByteField', LEFT_BYTE, RIGHT_BYTE),
-        ('SignedByteField', LEFT_SIGNED_BYTE, RIGHT_SIGNED_BYTE),
-        ('ShortField', LEFT_SHORT, RIGHT_SHORT),
-        ('SignedShortField', LEFT_SIGNED_SHORT, RIGHT_SIGNED_SHORT),
-        ('IntField', LEFT_INT, RIGHT_INT),
-        ('SignedIntField', LEFT_SIGNED_INT, RIGHT_SIGNED_INT),
-        ('LongField', LEFT_LONG, RIGHT_LONG),
-        ('SignedLongField', LEFT_SIGNED_LONG, RIGHT_SIGNED_LONG),
-    ]:
-        if class_name == name:
-            check_boundaries(
-                left,
-                right,
-                value,
-                message.format(name=field.name, attribute_name=attribute_name, left=left, right=right),
-            )
-            break
+    check_numeric_value(field, attribute.name if attribute.name[0] != '_' else attribute.name[1:], value)
+
+
+def hex_attribute() -> Any:
+    """
+    Returns the attribute storing whether a field is represented in hexadecimal. Slotted classes inheriting
+    `HexMixin` must declare it again with `_hex: bool = hex_attribute()`.
+    """
+    return attr.ib(kw_only=True, default=False, validator=[attr.validators.instance_of(bool)])
 
 
 @attr.s(repr=False)
 class HexMixin:
-    """Mixin class to get hexadecimal representation of field value."""
+    """
+    Mixin class to get hexadecimal representation of field value.
+
+    The mixin does not add an instance dictionary to its subclasses. Since attrs does not create slots for inherited
+    attributes, a class declared with `slots=True` which inherits this mixin must declare the hex attribute again
+    with `_hex: bool = hex_attribute()`.
+    """
 
-    _hex: bool = attr.ib(kw_only=True, default=False, validator=[attr.validators.instance_of(bool)])
+    __slots__ = ()
+
+    _hex: bool = hex_attribute()
 
     def __repr__(self):
-        value = hex(self._value) if self._hex else self._value
-        default = hex(self._default) if self._hex else self._default
-        return f'<{self.__class__.__name__}: name={self._name}, value={value}, default={default}>'
+        if self._hex:
+            return f'<{self.__class__.__name__}: name={self._name}, value={self._value:#x}, default={self._default:#x}>'
+        return f'<{self.__class__.__name__}: name={self._name}, value={self._value}, default={self._default}>'
 
     @property
     def hex(self) -> bool:
@@ -93,7 +94,7 @@ class HexMixin:
 # must be set to True.
 
 
-@attr.s(repr=False)
+@attr.s(slots=True, repr=False, getstate_setstate=False)
 class NumericField(HexMixin, CommonField):
     r"""
     Base class for many integer fields.
@@ -109,56 +110,68 @@ class NumericField(HexMixin, CommonField):
     `"!"`, `"<"` (little-endian), `">"` (big-endian), `"@"` (native), `"="` (standard).
     """
 
-    _default: int = attr.ib(validator=[attr.validators.instance_of(int), numeric_validator])
-    _value: int = attr.ib(init=False, validator=[attr.validators.instance_of(int), numeric_validator])
+    # (left, right) boundaries of valid values, None means any integer is accepted
+    _bounds: Optional[Tuple[int, int]] = None
+    _hex: bool = hex_attribute()
+    _default: int = attr.ib(validator=numeric_validator)
+    _value: int = attr.ib(init=False, validator=numeric_validator)
+
+    @property
+    def value(self) -> int:
+        """Returns field's value."""
+        return self._value
+
+    @value.setter
+    def value(self, value: int) -> None:
+        """Sets field's value."""
+        check_numeric_value(self, 'value', value)
+        self._value = value
 
     def compute_value(self, data: bytes, packet: 'Packet' = None) -> bytes:
-        if len(data) < self._size:
-            return b''
+        return data[self.compute_value_at(data, 0, packet) :]
+
+    def compute_value_at(self, data: bytes, offset: int, packet: 'Packet' = None) -> int:
+        if len(data) - offset < self._size:
+            return len(data)
 
-        self._value = self._struct.unpack(data[: self._size])[0]
+        self._value = self._struct.unpack_from(data, offset)[0]
         self._value_was_computed = True
-        return data[self._size:]  # fmt: skip
+        return offset + self._size
+
+
+@functools.lru_cache(maxsize=None)
+def _get_enum_mapping(enumeration: enum.EnumMeta) -> Dict[Any, str]:
+    return {item.value: item.name for item in enumeration}
 
 
 def enum_to_dict(enumeration: enum.EnumMeta) -> Any:
     if not isinstance(enumeration, enum.EnumMeta):
         return enumeration
 
-    return {item.value: item.name for item in enumeration}
+    # iterating an enum is slow, so the mapping is computed once per enum and each field gets its own copy
+    return dict(_get_enum_mapping(enumeration))
+
 
+def enumeration_validator(field: Union[CommonField, 'FieldPart'], _, enumeration: Dict[int, str]) -> None:
+    if not isinstance(enumeration, dict):
+        raise TypeError(f'enumeration must be a dict but you provided {enumeration!r}')
 
-def enum_key_validator(field: CommonField, _, enumeration: Dict[int, str]) -> None:
-    class_name = field.__class__.__name__
-    message = 'all keys in enumeration attribute must be between {left} and {right}'
-    for key in enumeration:
-        for name, left, right in [
-            ('ByteEnumField', LEFT_BYTE, RIGHT_BYTE),
-            ('SignedByteEnumField', LEFT_SIGNED_BYTE, RIGHT_SIGNED_BYTE),
-            ('ShortEnumField', LEFT_SHORT, RIGHT_SHORT),
-            ('SignedShortEnumField', LEFT_SIGNED_SHORT, RIGHT_SIGNED_SHORT),
-            ('IntEnumField', LEFT_INT, RIGHT_INT),
-            ('SignedIntEnumField', LEFT_SIGNED_INT, RIGHT_SIGNED_INT),
-            ('LongEnumField', LEFT_LONG, RIGHT_LONG),
-            ('SignedLongEnumField', LEFT_SIGNED_LONG, RIGHT_SIGNED_LONG),
-        ]:
-            if class_name == name:
-                check_boundaries(left, right, key, message.format(left=left, right=right))
-                break
+    # types and boundaries are checked in a single pass over the enumeration
+    bounds = getattr(field, '_bounds', None)
+    left, right = (None, None) if bounds is None else bounds
+    for key, value in enumeration.items():
+        if not isinstance(key, int):
+            raise TypeError(f'all keys in enumeration attribute must be integers but you provided {key!r}')
+        if not isinstance(value, str):
+            raise TypeError(f'all values in enumeration attribute must be strings but you provided {value!r}')
+        if bounds is not None and not left <= key <= right:
+            raise ValueError(f'all keys in enumeration attribute must be between {left} and {right}')
 
 
 @attr.s
 class EnumMixin:
     _enumeration: Union[enum.EnumMeta, Dict[int, str]] = attr.ib(
-        converter=enum_to_dict,
-        validator=[
-            attr.validators.deep_mapping(
-                key_validator=attr.validators.instance_of(int),
-                value_validator=attr.validators.instance_of(str),
-                mapping_validator=attr.validators.instance_of(dict),
-            ),
-            enum_key_validator,
-        ],
+        converter=enum_to_dict, validator=enumeration_validator
     )
 
     @property
@@ -170,25 +183,45 @@ class EnumMixin:
 # Normal fields
 
 
-# TODO: see why slots attribute does not work as expected
 @attr.s(repr=False, slots=True)
 class ByteField(NumericField):
     """Field class to represent one unsigned byte of network information."""
 
+    _bounds = (LEFT_BYTE, RIGHT_BYTE)
     _format: str = attr.ib(init=False, default='B')
 
+    def compute_value_at(self, data: bytes, offset: int, packet: 'Packet' = None) -> int:
+        # one byte is decoded faster by indexing data than with the struct module
+        if offset >= len(data):
+            return len(data)
+
+        self._value = data[offset]
+        self._value_was_computed = True
+        return offset + 1
+
 
 @attr.s(repr=False, slots=True)
 class SignedByteField(NumericField):
     """Field class to represent one signed byte of network information."""
 
+    _bounds = (LEFT_SIGNED_BYTE, RIGHT_SIGNED_BYTE)
     _format: str = attr.ib(init=False, default='b')
 
+    def compute_value_at(self, data: bytes, offset: int, packet: 'Packet' = None) -> int:
+        # one byte is decoded faster by indexing data than with the struct module
+        if offset >= len(data):
+            return len(data)
+
+        self._value = (data[offset] ^ 0x80) - 0x80
+        self._value_was_computed = True
+        return offset + 1
+
 
 @attr.s(repr=False, slots=True)
 class ShortField(NumericField):
     """Field class to represent two unsigned bytes of network information."""
 
+    _bounds = (LEFT_SHORT, RIGHT_SHORT)
     _format: str = attr.ib(init=False, default='H')
 
 
@@ -196,6 +229,7 @@ class ShortField(NumericField):
 class SignedShortField(NumericField):
     """Field class to represent two signed bytes of network information."""
 
+    _bounds = (LEFT_SIGNED_SHORT, RIGHT_SIGNED_SHORT)
     _format: str = attr.ib(init=False, default='h')
 
 
@@ -203,6 +237,7 @@ class SignedShortField(NumericField):
 class IntField(NumericField):
     """Field class to represent four unsigned bytes of network information."""
 
+    _bounds = (LEFT_INT, RIGHT_INT)
     _format: str = attr.ib(init=False, default='I')
 
 
@@ -210,6 +245,7 @@ class IntField(NumericField):
 class SignedIntField(NumericField):
     """Field class to represent four signed bytes of network information."""
 
+    _bounds = (LEFT_SIGNED_INT, RIGHT_SIGNED_INT)
     _format: str = attr.ib(init=False, default='i')
 
 
@@ -217,6 +253,7 @@ class SignedIntField(NumericField):
 class LongField(NumericField):
     """Field class to represent eight unsigned bytes of network information."""
 
+    _bounds = (LEFT_LONG, RIGHT_LONG)
     _format: str = attr.ib(init=False, default='Q')
 
 
@@ -224,6 +261,7 @@ class LongField(NumericField):
 class SignedLongField(NumericField):
     """Field class to represent eight signed bytes of network information."""
 
+    _bounds = (LEFT_SIGNED_LONG, RIGHT_SIGNED_LONG)
     _format: str = attr.ib(init=False, default='q')
 
 
@@ -336,16 +374,26 @@ class FixedStringField(CommonField):
 
         self._length = length
         self._decode = decode
+        # utf-8 encoding of the last string value returned by raw and that string, to avoid encoding it again
+        self._encoded: Optional[bytes] = None
+        self._encoded_value: Optional[str] = None
         super().__init__(name, default, format=f'{length}s')
 
     def compute_value(self, data: bytes, packet: 'Packet' = None) -> Optional[bytes]:
-        if len(data) < self._size:
-            return b''
+        return data[self.compute_value_at(data, 0, packet) :]
+
+    def compute_value_at(self, data: bytes, offset: int, packet: 'Packet' = None) -> int:
+        if len(data) - offset < self._size:
+            return len(data)
 
-        value: bytes = self._struct.unpack(data[: self._size])[0]
-        self._value = value.decode() if self._decode else value
+        if self._decode:
+            # decoding a slice of data gives the same string, without building the tuple returned by the struct
+            self._value = data[offset : offset + self._size].decode()
+        else:
+            # the struct always returns bytes, whatever the type of data
+            self._value = self._struct.unpack_from(data, offset)[0]
         self._value_was_computed = True
-        return data[self._size :]
+        return offset + self._size
 
     @property
     def value(self) -> AnyStr:
@@ -372,7 +420,10 @@ class FixedStringField(CommonField):
     def raw(self, packet: 'Packet' = None) -> bytes:
         """Returns bytes encoded value of the internal string."""
         if self._decode:
-            return self._value.encode()
+            if self._encoded_value is not self._value:
+                self._encoded = self._value.encode()
+                self._encoded_value = self._value
+            return self._encoded
         return bytes(self._value)
 
     def random_value(self) -> AnyStr:
@@ -395,7 +446,8 @@ class FieldPart(HexMixin):
     attribute is optional.
     """
 
-    _name: str = attr.ib(validator=[attr.validators.instance_of(str), name_validator])
+    _hex: bool = hex_attribute()
+    _name: str = attr.ib(converter=intern_name, validator=[attr.validators.instance_of(str), name_validator])
     _default: int = attr.ib(validator=attr.validators.instance_of(int))
     _size: int = attr.ib(validator=attr.validators.instance_of(int))
     _value: int = attr.ib(init=False)
@@ -403,13 +455,7 @@ class FieldPart(HexMixin):
     _enumeration: Optional[Union[enum.EnumMeta, Dict[int, str]]] = attr.ib(
         default=None,
         converter=enum_to_dict,
-        validator=attr.validators.optional(
-            attr.validators.deep_mapping(
-                key_validator=attr.validators.instance_of(int),
-                value_validator=attr.validators.instance_of(str),
-                mapping_validator=attr.validators.instance_of(dict),
-            )
-        ),
+        validator=attr.validators.optional(enumeration_validator),
     )
 
     def __attrs_post_init__(self):
@@ -470,16 +516,26 @@ class FieldPart(HexMixin):
     def clone(self) -> 'FieldPart':
         return copy(self)
 
+    def __copy__(self) -> 'FieldPart':
+        return shallow_copy(self)
+
     def __repr__(self):
         if self._enumeration is not None:
             value = self._enumeration.get(self._value, self._value)
             default = self._enumeration.get(self._default, self._default)
+        elif self._hex:
+            value = hex(self._value)
+            default = hex(self._default)
         else:
-            value = hex(self._value) if self._hex else self._value
-            default = hex(self._default) if self._hex else self._default
+            value = self._value
+            default = self._default
         return f'{self.__class__.__name__}(name={self._name}, default={default}, value={value})'
 
 
+# struct formats of unsigned integers a bits field can be made of
+BITS_FIELD_FORMATS = frozenset('BHIQ')
+
+
 @attr.s(slots=True, repr=False)
 class BitsField(HexMixin, Field):
     """
@@ -496,13 +552,17 @@ class BitsField(HexMixin, Field):
     `BitsField([FieldPart('version', 4, 4), FieldPart('IHL', 5, 4)], format='B')`
     """
 
+    _hex: bool = hex_attribute()
     _parts: List[FieldPart] = attr.ib(
         validator=attr.validators.deep_iterable(member_validator=attr.validators.instance_of(FieldPart))
     )
-    _format: str = attr.ib(validator=attr.validators.in_(['B', 'H', 'I', 'Q']))
-    _order: str = attr.ib(kw_only=True, default='!', validator=attr.validators.in_(['<', '>', '!', '@', '=']))
+    _format: str = attr.ib(validator=attr.validators.in_(BITS_FIELD_FORMATS))
+    _order: str = attr.ib(kw_only=True, default='!', validator=attr.validators.in_(BYTE_ORDERS))
     _struct: struct.Struct = attr.ib(init=False)
     _size: int = attr.ib(init=False)
+    # (shift, mask) pairs extracting the value of each part from the field value, computed once since parts sizes
+    # do not change
+    _layout: Tuple[Tuple[int, int], ...] = attr.ib(init=False, eq=False)
 
     @_parts.validator
     def _validate_parts(self, _, value: List[FieldPart]) -> None:
@@ -510,9 +570,8 @@ class BitsField(HexMixin, Field):
             raise ValueError('parts must not be an empty list')
 
     def __attrs_post_init__(self):
-        _format = f'{self._order}{self._format}'
-        self._struct = struct.Struct(_format)
-        self._size = struct.calcsize(_format)
+        self._struct = get_struct(f'{self._order}{self._format}')
+        self._size = self._struct.size
 
         parts_size = sum(part.size for part in self._parts)
         field_size_in_bits = self._size * 8
@@ -521,6 +580,14 @@ class BitsField(HexMixin, Field):
                 f'the sum in bits of the different FieldPart ({parts_size}) is different'
                 f' from the field size ({field_size_in_bits})'
             )
+
+        layout = []
+        shift = field_size_in_bits
+        for part in self._parts:
+            shift -= part.size
+            layout.append((shift, 2**part.size - 1))
+        self._layout = tuple(layout)
+
         # if hexadecimal representation is needed for this field, we need to forward
         # this information to all field parts
         if self._hex:
@@ -534,7 +601,7 @@ class BitsField(HexMixin, Field):
 
     @property
     def struct_format(self) -> str:
-        return f'{self._order}{self._format}'
+        return self._struct.format
 
     @property
     def size(self) -> int:
@@ -549,16 +616,10 @@ class BitsField(HexMixin, Field):
         return representation
 
     def _get_int_value_from_field_parts(self, default: bool = False) -> int:
-        binary_representation = ''
-        for field_part in self._parts:
-            field_value = field_part.default if default else field_part.value
-            bin_value = bin(field_value)[2:]
-            if len(bin_value) < field_part.size:
-                difference = field_part.size - len(bin_value)
-                bin_value = '0' * difference + bin_value
-            binary_representation += bin_value
-
-        return int(binary_representation, base=2)
+        value = 0
+        for field_part, (shift, _) in zip(self._parts, self._layout):
+            value |= (field_part.default if default else field_part.value) << shift
+        return value
 
     @property
     def default(self) -> int:
@@ -604,19 +665,12 @@ class BitsField(HexMixin, Field):
             if not 0 <= value <= max_value:
                 raise ValueError(f'integer value must be between 0 and {max_value}')
 
-            # we add leading 0 if necessary in the binary representation
-            bin_value = bin(value)[2:]
-            bin_value_length = len(bin_value)
-            size_in_bits = self._size * 8
-            if bin_value_length < size_in_bits:
-                bin_value = '0' * (size_in_bits - bin_value_length) + bin_value
+            self._set_field_parts_values(value)
 
-            # we fill the value with each field part and take care to update bin_value
-            # to the rest of the string not parsed
-            for field_part in self._parts:
-                str_value = bin_value[: field_part.size]
-                field_part.value = int(str_value, base=2)
-                bin_value = bin_value[field_part.size :]
+    def _set_field_parts_values(self, value: int) -> None:
+        # each part value is extracted with its mask, so it is always valid for the part
+        for field_part, (shift, mask) in zip(self._parts, self._layout):
+            field_part._value = (value >> shift) & mask
 
     def raw(self, packet: 'Packet' = None) -> bytes:
         return self._struct.pack(self.value)
@@ -629,12 +683,17 @@ class BitsField(HexMixin, Field):
 
     def compute_value(self, data: bytes, packet: 'Packet' = None) -> bytes:
         """Sets internal value of each field part and returns remaining bytes if any."""
-        if len(data) < self._size:
-            return b''
+        return data[self.compute_value_at(data, 0, packet) :]
+
+    def compute_value_at(self, data: bytes, offset: int, packet: 'Packet' = None) -> int:
+        """Sets internal value of each field part and returns the offset of the next byte to parse."""
+        if len(data) - offset < self._size:
+            return len(data)
 
-        self.value = self._struct.unpack(data[: self._size])[0]
+        # an unpacked value is always in the field range, so it is not checked again by the value setter
+        self._set_field_parts_values(self._struct.unpack_from(data, offset)[0])
         self._value_was_computed = True
-        return data[self._size :]
+        return offset + self._size
 
     def __getitem__(self, name: str) -> FieldPart:
         """Returns FieldPart which name corresponds to the one passed as argument."""
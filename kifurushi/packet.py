@@ -1,24 +1,137 @@
 """This module defines the base Packet class and helper functions."""
 import enum
 import inspect
+import operator
+import struct
 from copy import copy
-from typing import Any, Callable, Dict, Iterable, List, Type, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 from kifurushi.utils.network import hexdump
 
-from .abc import CommonField, Field
-from .fields import BitsField, ConditionalField, FieldPart
+from .abc import CommonField, Field, get_struct
+from .fields import BitsField, ByteField, ConditionalField, FieldPart, FixedStringField, NumericField, SignedByteField
+
+# a serialization step is either a struct with a getter returning the values of consecutive numeric and bits fields
+# from the packet attributes, or None with the index of a field serialized with its own raw method
+RawPlan = List[Tuple[Optional[struct.Struct], Union[Callable[['Packet'], Tuple[int, ...]], int]]]
+# a parsing step is a struct unpacking the values of consecutive numeric, bits and bytes fields when there is enough data,
+# or None when fields are parsed with their own methods, followed by the index of each field, the (shift, mask) pairs
+# extracting its parts from the unpacked value if it is a bits field or None, and whether the field can be parsed
+# with compute_value_at
+ParseStep = Tuple[int, Optional[Tuple[Tuple[int, int], ...]], bool]
+ParsePlan = List[Tuple[Optional[struct.Struct], Tuple[ParseStep, ...]]]
+# compute_value_at implementations which only unpack the field value, fields using them can be parsed together
+UNPACKING_COMPUTE_VALUE_AT = (
+    NumericField.compute_value_at,
+    ByteField.compute_value_at,
+    SignedByteField.compute_value_at,
+    BitsField.compute_value_at,
+)
+
+
+def _computes_value_at_offset(field_class: Type[Field]) -> bool:
+    """
+    Returns True if the field class overrides compute_value_at without overriding compute_value in a subclass,
+    meaning that compute_value_at can be used instead of compute_value to parse the field.
+    """
+    for klass in field_class.__mro__:
+        if 'compute_value_at' in vars(klass):
+            # the default implementation just calls compute_value
+            return klass is not Field
+        if 'compute_value' in vars(klass):
+            return False
+    return False  # pragma: no cover
+
+
+def _get_packing_format(field: Field) -> Optional[str]:
+    """
+    Returns the struct format of a numeric or bits field if its raw value is just its value packed, None otherwise.
+    """
+    field_class = type(field)
+    if isinstance(field, NumericField):
+        if field_class.raw is not CommonField.raw or field_class.value is not NumericField.value:
+            return None
+    elif isinstance(field, BitsField):
+        if field_class.raw is not BitsField.raw or field_class.value is not BitsField.value:
+            return None
+    else:
+        return None
+
+    struct_format = field.struct_format
+    # native order adds alignment padding, so fields using it cannot be packed together
+    return None if struct_format[0] == '@' else struct_format
+
+
+def _get_unpacking_format(field: Field) -> Optional[str]:
+    """
+    Returns the struct format of a numeric, bits or bytes field if parsing it just unpacks its value from data,
+    None otherwise.
+    """
+    field_class = type(field)
+    if not _computes_value_at_offset(field_class):
+        return None
+
+    if isinstance(field, FixedStringField):
+        # decoded strings are not the unpacked bytes
+        # noinspection PyProtectedMember
+        if field_class.compute_value_at is not FixedStringField.compute_value_at or field._decode:
+            return None
+        return field.struct_format
+
+    if field_class.compute_value_at not in UNPACKING_COMPUTE_VALUE_AT:
+        return None
+    return _get_packing_format(field)
+
+
+def _get_values_getter(fields: List[Field]) -> Callable[['Packet'], Tuple[int, ...]]:
+    """Returns a function reading the values of the given numeric and bits fields from packet attributes."""
+    names = []
+    # for each field, the position of its first value in the attributes read and the shifts of its parts
+    # if it is a bits field, None otherwise
+    layout = []
+    for field in fields:
+        if isinstance(field, BitsField):
+            # noinspection PyProtectedMember
+            shifts = tuple(shift for shift, _ in field._layout)
+            layout.append((len(names), shifts))
+            names.extend(part.name for part in field.parts)
+        else:
+            layout.append((len(names), None))
+            names.append(field.name)
+
+    if all(shifts is None for _, shifts in layout):
+        return operator.attrgetter(*names)
+
+    def get_values(packet: 'Packet') -> Tuple[int, ...]:
+        attributes = [getattr(packet, name) for name in names]
+        values = []
+        for start, shifts in layout:
+            if shifts is None:
+                values.append(attributes[start])
+            else:
+                # field parts values are mirrored in packet attributes, so the field value is computed from them
+                value = 0
+                for attribute, shift in zip(attributes[start:], shifts):
+                    value |= attribute << shift
+                values.append(value)
+        return values
+
+    return get_values
 
 
 class Packet:
     __fields__: Iterable[Field] = None
+    # byte value of packets only made of numeric and bits fields, reset each time one of their attributes is set
+    _raw_cache: Optional[bytes] = None
 
     def __init__(self, **kwargs):
         self._fields = [field.clone() for field in self.__fields__]
         self._field_mapping = self._create_field_mapping(self._fields)
         self._check_arguments(kwargs)
-        value_mapping = {**self._get_default_values(), **kwargs}
-        for name, value in value_mapping.items():
+        # default values were validated when fields were created, so they are mirrored without going through
+        # __setattr__, this matters when many packets are created by from_bytes
+        self.__dict__.update(self._get_default_values())
+        for name, value in kwargs.items():
             setattr(self, name, value)
 
     @staticmethod
@@ -68,6 +181,52 @@ class Packet:
         else:
             setattr(packet, field.name, field.value)
 
+    @staticmethod
+    def _compute_parse_plan(fields: List[Field]) -> ParsePlan:
+        plan = []
+        order = None
+        formats = ''
+        run = []
+
+        def add_run():
+            if len(run) > 1:
+                plan.append((get_struct(f'{order}{formats}'), tuple(run)))
+            elif run:
+                plan.append((None, tuple(run)))
+
+        for index, field in enumerate(fields):
+            # conditional fields depend on previously parsed fields, so they cannot be parsed with others
+            at_offset = _computes_value_at_offset(type(field))
+            struct_format = _get_unpacking_format(field)
+            step = (index, None, at_offset)
+            if struct_format is not None and isinstance(field, BitsField):
+                # noinspection PyProtectedMember
+                step = (index, field._layout, at_offset)
+
+            if struct_format is not None and struct_format[0] == order:
+                formats += struct_format[1:]
+                run.append(step)
+                continue
+
+            add_run()
+            if struct_format is None:
+                order, formats, run = None, '', []
+                plan.append((None, (step,)))
+            else:
+                order, formats, run = struct_format[0], struct_format[1:], [step]
+
+        add_run()
+        return plan
+
+    @classmethod
+    def _get_parse_plan(cls, fields: List[Field]) -> ParsePlan:
+        # like serialization plans, the parsing plan is stored in the class dict
+        plan = cls.__dict__.get('_parse_plan')
+        if plan is None:
+            plan = cls._compute_parse_plan(fields)
+            cls._parse_plan = plan
+        return plan
+
     @classmethod
     def from_bytes(cls, data: bytes) -> 'Packet':
         """
@@ -78,11 +237,44 @@ class Packet:
         **data:** The raw bytes used to construct a packet object.
         """
         packet = cls()
-        for field in packet._fields:
-            data = field.compute_value(data, packet)
-            # we need to set directly the field after it is parsed, so that next fields depending on
-            # previous fields can check whether or not they need to parse data
-            cls._set_packet_attribute(field, packet)
+        fields = packet._fields
+        # position of the next byte to parse in data, it avoids copying remaining bytes after each parsed field
+        offset = 0
+        for unpacker, steps in cls._get_parse_plan(fields):
+            if unpacker is not None and len(data) - offset >= unpacker.size:
+                # unpacked values are valid for their fields, so there is no need to validate them again
+                for (index, parts, _), value in zip(steps, unpacker.unpack_from(data, offset)):
+                    field = fields[index]
+                    field._value_was_computed = True
+                    if parts is None:
+                        # noinspection PyProtectedMember
+                        field._value = value
+                        object.__setattr__(packet, field.name, value)
+                        continue
+
+                    # noinspection PyProtectedMember
+                    for part, (shift, mask) in zip(field._parts, parts):
+                        part_value = (value >> shift) & mask
+                        part._value = part_value
+                        object.__setattr__(packet, part.name, part_value)
+                # attributes were set without __setattr__, so a byte value computed before is no longer valid
+                if packet._raw_cache is not None:
+                    object.__setattr__(packet, '_raw_cache', None)
+                offset += unpacker.size
+                continue
+
+            for index, _, at_offset in steps:
+                field = fields[index]
+                if at_offset:
+                    offset = field.compute_value_at(data, offset, packet)
+                else:
+                    if offset:
+                        data = data[offset:]
+                        offset = 0
+                    data = field.compute_value(data, packet)
+                # we need to set directly the field after it is parsed, so that next fields depending on
+                # previous fields can check whether or not they need to parse data
+                cls._set_packet_attribute(field, packet)
 
         return packet
 
@@ -131,6 +323,9 @@ class Packet:
             super_set_attr(name, value)
             return
 
+        # the byte value of the packet depends on its field values, so it must be computed again
+        if self._raw_cache is not None:
+            super_set_attr('_raw_cache', None)
         field = self._field_mapping[name]
         if isinstance(field, BitsField):
             self._set_enum_field(field[name], value, super_set_attr)
@@ -141,10 +336,107 @@ class Packet:
             field.value = value
             super_set_attr(name, value)
 
+    @staticmethod
+    def _compute_raw_plan(fields: List[Field], mask: int) -> RawPlan:
+        plan = []
+        # current run of consecutive numeric fields with the same byte order
+        order = None
+        formats = ''
+        run = []
+
+        def add_run():
+            # a single numeric field is as fast to serialize with its own raw method
+            if len(run) == 1 and not isinstance(run[0][1], BitsField):
+                plan.append((None, run[0][0]))
+            elif run:
+                getter = _get_values_getter([field for _, field in run])
+                plan.append((get_struct(f'{order}{formats}'), getter))
+
+        for index, field in enumerate(fields):
+            if isinstance(field, ConditionalField):
+                # fields whose condition is false are not serialized
+                if not mask & (1 << index):
+                    continue
+                # noinspection PyProtectedMember
+                field = field._field
+            struct_format = _get_packing_format(field)
+
+            if struct_format is not None and struct_format[0] == order:
+                formats += struct_format[1:]
+                run.append((index, field))
+                continue
+
+            add_run()
+            if struct_format is None:
+                order, formats, run = None, '', []
+                plan.append((None, index))
+            else:
+                order, formats, run = struct_format[0], struct_format[1:], [(index, field)]
+
+        add_run()
+        return plan
+
+    @classmethod
+    def _get_raw_plans(cls, fields: List[Field]) -> Tuple[List[Tuple[int, int]], Dict[int, RawPlan]]:
+        # plans are stored in the class dict so that a subclass does not use the plans of its parent class
+        raw_plans = cls.__dict__.get('_raw_plans')
+        if raw_plans is None:
+            # conditional fields sharing the same condition are grouped, so that it is evaluated once
+            # each group is represented by the index of its first field and the mask of all its fields
+            # conditions are keyed by identity since any callable, even an unhashable one, can be used
+            groups: Dict[int, List[int]] = {}
+            for index, field in enumerate(fields):
+                if isinstance(field, ConditionalField):
+                    group = groups.setdefault(id(field.condition), [index, 0])
+                    group[1] |= 1 << index
+            raw_plans = ([(index, group_mask) for index, group_mask in groups.values()], {})
+            cls._raw_plans = raw_plans
+        return raw_plans
+
     @property
     def raw(self) -> bytes:
-        """Returns bytes corresponding to what will be sent on the network."""
-        return b''.join(field.raw(self) for field in self._fields)
+        """
+        Returns bytes corresponding to what will be sent on the network.
+        """
+        if self._raw_cache is not None:
+            return self._raw_cache
+
+        fields = self._fields
+        condition_groups, plans = self._get_raw_plans(fields)
+        # the plan to serialize the packet depends on the conditional fields which must be serialized
+        mask = 0
+        for index, group_mask in condition_groups:
+            if fields[index].condition(self):
+                mask |= group_mask
+
+        plan = plans.get(mask)
+        if plan is None:
+            plan = plans[mask] = self._compute_raw_plan(fields, mask)
+
+        if len(plan) == 1 and plan[0][0] is not None:
+            # packets only made of numeric and bits fields are serialized by a single pack call
+            packer, getter = plan[0]
+            raw = packer.pack(*getter(self))
+            if not condition_groups:
+                # the byte value only depends on integer field values mirrored in packet attributes, so it can be
+                # reused until one of these attributes is set
+                object.__setattr__(self, '_raw_cache', raw)
+        else:
+            data = []
+            for packer, item in plan:
+                if packer is None:
+                    field = fields[item]
+                    # the condition of this field is already known to be true, there is no need to evaluate it again
+                    if mask >> item & 1:
+                        # noinspection PyProtectedMember
+                        field = field._field
+                    data.append(field.raw(self))
+                else:
+                    # numeric field values are mirrored in packet attributes, so they are all read in one call
+                    data.append(packer.pack(*item(self)))
+            raw = b''.join(data)
+
+        return raw
 
     def __bytes__(self):
         return self.raw
@@ -1,5 +1,4 @@
 """Module which contains various helper functions useful when handling kifurushi packets."""
-import array
 import struct
 from typing import Union
 
@@ -12,42 +11,31 @@ def smart_ord(value: Union[int, bytes]) -> int:
     return ord(value)
 
 
+# maps each byte to itself if it is a printable ascii character, to a dot otherwise
+SANE_TABLE = bytes(byte if 32 <= byte < 127 else ord('.') for byte in range(256))
+
+
 # I don't know how to test this function directly, so it is indirectly test by hexdump function.
 def sane_value(value: bytes) -> str:
-    result = ''
-    for i in value:
-        j = smart_ord(i)
-        if (j < 32) or (j >= 127):
-            result += '.'
-        else:
-            result += chr(j)
-    return result
+    return bytes(value).translate(SANE_TABLE).decode('ascii')
 
 
-def hexdump(data: bytes) -> str:
+def hexdump(data: Union[bytes, bytearray, str]) -> str:
     """
     Returns tcpdump / wireshark like hexadecimal view of the given data.
 
     **Parameters:**
 
-    * **data:** The bytes to parse.
+    * **data:** The bytes to parse. A string is also accepted, each of its characters is shown as one byte.
     """
-    result = ''
-    data_length = len(data)
-    i = 0
-
-    while i < data_length:
-        result += '%04x  ' % i
-        for j in range(16):
-            if i + j < data_length:
-                result += '%02X ' % smart_ord(data[i + j])
-            else:
-                result += '   '
-        result += ' %s\n' % sane_value(data[i : i + 16])
-        i += 16
-    # remove trailing \n
-    result = result[:-1] if result.endswith('\n') else result
-    return result
+    # each character of a string is its own byte value, like when the view was computed with ord
+    data = data.encode('latin-1') if isinstance(data, str) else bytes(data)
+    lines = []
+    for i in range(0, len(data), 16):
+        chunk = data[i : i + 16]
+        # bytes are formatted in C by the hex method, the hexadecimal column of an incomplete line is padded
+        lines.append(f'{i:04x}  {chunk.hex(" ").upper():<47}  {sane_value(chunk)}')
+    return '\n'.join(lines)
 
 
 # == checksum ==
@@ -71,10 +59,14 @@ def checksum(data: bytes) -> int:
     if not isinstance(data, bytes):
         raise TypeError(f'data must be bytes but you provided {data}')
 
+    # since 2**16 = 1 modulo 0xFFFF, the one's complement sum of the 16-bit words is congruent to the whole data
+    # read as a big-endian number modulo 0xFFFF, so the sum is done in C without iterating over each word
+    number = int.from_bytes(data, 'big')
+    # data of odd length is padded with a null byte, shifting the number avoids copying data to append it
     if len(data) % 2 == 1:
-        data += b'\0'
-    s = sum(array.array('H', data))
-    s = (s >> 16) + (s & 0xFFFF)
-    s += s >> 16
-    s = ~s
-    return check_endian_transform(s) & 0xFFFF
+        number <<= 8
+    total = number % 0xFFFF
+    # with end-around carries, the sum of non-null data is never 0 but 0xFFFF
+    if not total and number:
+        total = 0xFFFF
+    return ~total & 0xFFFF
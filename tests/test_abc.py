@@ -1,9 +1,10 @@
+import sys
 from typing import Union
 
 import attr
 import pytest
 
-from kifurushi.abc import CommonField, Field, VariableStringField
+from kifurushi.abc import CommonField, Field, VariableStringField, shallow_copy
 from kifurushi.utils import random_values
 
 
@@ -64,10 +65,54 @@ class TestField:
         assert cloned_field == field
         assert cloned_field is not field
 
+    @pytest.mark.parametrize(('data', 'offset', 'next_offset'), [(b'abcde', 0, 2), (b'abcde', 1, 3), (b'abcde', 4, 5)])
+    def test_should_compute_value_at_offset_with_compute_value_by_default(self, data, offset, next_offset):
+        class TwoBytesField(FakeField):
+            def compute_value(self, data: bytes, packet: 'Packet' = None) -> bytes:  # noqa: F821
+                return data[2:]
+
+        assert next_offset == TwoBytesField().compute_value_at(data, offset)
+
     def test_should_check_property_value_was_computed_defaults_to_false(self):
         field = FakeField()
         assert field.value_was_computed is False
 
+    def test_should_not_have_instance_dict_when_subclass_uses_slots(self):
+        field = attr.s(slots=True, repr=False)(FakeField)()
+        assert not hasattr(field, '__dict__')
+
+
+class TestShallowCopy:
+    """Tests function shallow_copy"""
+
+    def test_should_copy_slots_and_instance_dict(self):
+        field = FakeField()
+        field._value_was_computed = True
+        field.extra = [1]
+        copied_field = shallow_copy(field)
+
+        assert copied_field is not field
+        assert copied_field.value_was_computed is True
+        assert copied_field.extra is field.extra
+
+    def test_should_copy_object_without_slots(self):
+        class Plain:
+            def __init__(self):
+                self.value = 2
+
+        assert 2 == shallow_copy(Plain()).value
+
+    def test_should_only_copy_slots_having_a_value(self):
+        class Slotted:
+            __slots__ = ('first', 'second')
+
+        slotted = Slotted()
+        slotted.first = 1
+        copied_slotted = shallow_copy(slotted)
+
+        assert 1 == copied_slotted.first
+        assert not hasattr(copied_slotted, 'second')
+
 
 @attr.s(repr=False)
 class DummyField(CommonField):
@@ -97,6 +142,12 @@ class TestCommonField:
         with pytest.raises(TypeError):
             DummyField(**arguments)
 
+    def test_should_intern_field_name(self):
+        name = ''.join(['fo', 'o'])
+        field = DummyField(name, 2, format='b')
+
+        assert field.name is sys.intern('foo')
+
     @pytest.mark.parametrize('name', [' hello', 'hello ', 'foo-bar', 'f@o'])
     def test_should_raise_error_when_given_name_is_not_correct(self, name):
         with pytest.raises(ValueError) as exc_info:
@@ -111,9 +162,15 @@ class TestCommonField:
 
     @pytest.mark.parametrize('_format', ['o', 'xs'])
     def test_should_raise_error_when_format_is_incorrect(self, _format):
-        with pytest.raises(ValueError):
+        with pytest.raises(ValueError) as exc_info:
             DummyField('foo', 'hello', format=_format)
 
+        message = (
+            'DummyField format must be one of b, B, h, H, i, I, q, Q or a length followed by s'
+            f' but you provided {_format}'
+        )
+        assert message == str(exc_info.value)
+
     @pytest.mark.parametrize('_format', ['b', 'B', 'h', 'H', 'i', 'I', 'q', 'Q', '02s', '12s'])
     def test_should_not_raise_error_when_giving_correct_format(self, _format):
         try:
@@ -188,6 +245,14 @@ class TestCommonField:
         assert cloned_field == field
         assert cloned_field is not field
 
+    def test_should_share_struct_object_between_fields_with_the_same_format(self):
+        field_1 = DummyField('foo', 2, format='i')
+        field_2 = DummyField('foo', 2, format='i')
+
+        assert field_1._struct is field_2._struct
+        assert field_1 == field_2
+        assert field_1._struct is not DummyField('foo', 2, format='i', order='<')._struct
+
     # tests raw method
 
     def test_should_return_correct_byte_value_when_calling_raw_property(self):
@@ -330,6 +395,16 @@ class TestVariableStringField:
 
         assert b'banana' == field.raw()
 
+    def test_should_reuse_encoded_value_until_value_changes(self):
+        field = DummyStringField('fruit', 'banana', decode=True)
+        raw = field.raw()
+
+        assert raw is field.raw()
+
+        # compute_value implementations set the internal value directly
+        field._value = 'apple'
+        assert b'apple' == field.raw()
+
     # test of struct_format property
 
     @pytest.mark.parametrize(
@@ -0,0 +1,155 @@
+import pytest
+
+from examples.dns import DNS, MAX_POINTER_HOPS, DNSTypes, DomainNameField, Question, ResourceRecord
+from kifurushi import Packet
+
+# a 12-byte header followed by the "example.com" name
+RAW_PACKET = b'\x00' * 12 + b'\x07example\x03com\x00'
+
+
+class TestDomainNameField:
+    """Tests the parsing of domain names in the dns example"""
+
+    @staticmethod
+    def get_field(raw_packet: bytes = RAW_PACKET) -> DomainNameField:
+        field = DomainNameField('kifurushi.org')
+        field.raw_packet = raw_packet
+        return field
+
+    def test_should_parse_name_ending_with_a_pointer(self):
+        field = self.get_field()
+        remaining_data = field.compute_value(b'\x03www\xc0\x0c\x00\x01')
+
+        assert b'\x00\x01' == remaining_data
+        assert 'www.example.com.' == field.value
+        assert 0xC00C == field.pointer_value
+        assert field.value_was_computed is True
+
+    def test_should_raise_error_when_pointers_loop(self):
+        field = self.get_field(b'\x00' * 12 + b'\xc0\x0e\xc0\x0c')
+
+        with pytest.raises(ValueError) as exc_info:
+            field.compute_value(b'\xc0\x0c')
+
+        assert 'domain name pointer chain is too deep or cyclic' == str(exc_info.value)
+
+    @staticmethod
+    def get_pointer_chain(length: int) -> bytes:
+        # each pointer of the chain references the next one, the last one references the root name
+        chain = b''.join((0xC000 | (14 + 2 * index)).to_bytes(2, 'big') for index in range(length))
+        return b'\x00' * 12 + chain + b'\x00'
+
+    def test_should_follow_pointer_chain_up_to_the_maximum_number_of_hops(self):
+        field = self.get_field(self.get_pointer_chain(MAX_POINTER_HOPS - 1))
+        field.compute_value(b'\x03www\xc0\x0c')
+
+        assert 'www.' == field.value
+
+    def test_should_raise_error_when_pointer_chain_is_too_deep(self):
+        field = self.get_field(self.get_pointer_chain(MAX_POINTER_HOPS))
+
+        with pytest.raises(ValueError) as exc_info:
+            field.compute_value(b'\xc0\x0c')
+
+        assert 'domain name pointer chain is too deep or cyclic' == str(exc_info.value)
+
+    def test_should_raise_error_when_pointer_is_out_of_packet_bounds(self):
+        field = self.get_field()
+
+        with pytest.raises(ValueError) as exc_info:
+            field.compute_value(b'\xc0\xff')
+
+        assert 'domain name pointer is out of the packet bounds' == str(exc_info.value)
+
+    @pytest.mark.parametrize('data', [b'\x05ab', b'\x03www', b'\x03www\xc0'])
+    def test_should_raise_error_when_name_is_truncated(self, data):
+        field = self.get_field()
+
+        with pytest.raises(ValueError) as exc_info:
+            field.compute_value(data)
+
+        assert 'truncated' in str(exc_info.value)
+
+    def test_should_raise_error_when_label_referenced_by_a_pointer_is_truncated(self):
+        field = self.get_field(b'\x00' * 12 + b'\x07exa')
+
+        with pytest.raises(ValueError) as exc_info:
+            field.compute_value(b'\xc0\x0c')
+
+        assert 'domain name label is truncated' == str(exc_info.value)
+
+
+class TestDNSRecord:
+    """Tests the integration of dns example records with the Packet class"""
+
+    def test_should_keep_packet_parse_plan_hook(self):
+        question = Question(qname='example.com', qtype=28)
+        # DNS records use their own parse method, but the generic one of Packet must still work on them
+        parsed_question = Packet.from_bytes.__func__(Question, question.raw)
+
+        assert Question._get_parse_plan.__func__ is Packet._get_parse_plan.__func__
+        assert parsed_question.raw == question.raw
+        assert 'example.com.' == parsed_question.qname
+        assert 28 == parsed_question.qtype
+
+
+class TestDNS:
+    """Tests the serialization and parsing of dns example messages"""
+
+    @staticmethod
+    def get_dns() -> DNS:
+        answers = [
+            ResourceRecord(name='example.com', type=DNSTypes.A, a='1.2.3.4', rdlength=4),
+            ResourceRecord(name='www.Example.com', type=DNSTypes.A, a='1.2.3.5', rdlength=4),
+        ]
+        return DNS(qdcount=1, ancount=2, questions=[Question(qname='example.com')], answers=answers)
+
+    def test_should_compress_names_already_written_in_the_message(self):
+        raw = self.get_dns().raw
+
+        # the question name starts right after the 12-byte header, at offset 0x0C
+        assert 1 == raw.count(b'\x07example\x03com\x00')
+        assert raw[29:31] == b'\xc0\x0c'
+        assert b'\x03www\xc0\x0c' in raw
+        assert 65 == len(raw)
+
+    def test_should_parse_compressed_message_and_keep_its_layout(self):
+        raw = self.get_dns().raw
+        dns = DNS.from_bytes(raw)
+
+        assert ['example.com.'] == [question.qname for question in dns.questions]
+        assert ['example.com.', 'www.example.com.'] == [answer.name for answer in dns.answers]
+        assert ['1.2.3.4', '1.2.3.5'] == [answer.a for answer in dns.answers]
+        assert raw == dns.raw
+
+    def test_should_skip_rdata_of_unknown_record_type(self):
+        # MX records are not handled by the example, their rdata must be skipped using rdlength
+        unknown_record = ResourceRecord(name='example.com', type=15, rdlength=3).raw + b'\x00\x0a\x00'
+        known_record = ResourceRecord(name='example.com', type=DNSTypes.A, a='1.2.3.4', rdlength=4).raw
+        header = DNS(ancount=2).raw
+        dns = DNS.from_bytes(header + unknown_record + known_record)
+
+        assert [15, DNSTypes.A] == [answer.type for answer in dns.answers]
+        assert '1.2.3.4' == dns.answers[1].a
+
+    def test_should_return_number_of_bytes_consumed_by_record(self):
+        record = ResourceRecord(name='example.com', type=15, rdlength=3).raw + b'\x00\x0a\x00'
+
+        answer, consumed = ResourceRecord.parse(record + b'remaining')
+
+        assert len(record) == consumed
+        assert 'example.com.' == answer.name
+
+    def test_should_accept_type_and_class_names(self):
+        question = Question(qname='example.com', qtype='AAAA', qclass='CH')
+
+        assert 28 == question.qtype
+        assert 3 == question.qclass
+        assert b'\x00\x1c\x00\x03' == question.raw[-4:]
+
+    def test_should_use_rdata_field_of_type_given_by_name(self):
+        record = ResourceRecord(name='example.com', type='AAAA', aaaa='::2', rdlength=16)
+        parsed_record = ResourceRecord.from_bytes(record.raw)
+
+        assert DNSTypes.AAAA == parsed_record.type
+        assert '::2' == parsed_record.aaaa
@@ -12,6 +12,7 @@ from kifurushi.fields import (
     ByteEnumField,
     ByteField,
     ConditionalField,
+    EnumMixin,
     FieldPart,
     FixedStringField,
     HexMixin,
@@ -21,6 +22,7 @@ from kifurushi.fields import (
     LongBitsField,
     LongEnumField,
     LongField,
+    NumericField,
     ShortBitsField,
     ShortEnumField,
     ShortField,
@@ -33,6 +35,7 @@ from kifurushi.fields import (
     SignedShortEnumField,
     SignedShortField,
     enum_to_dict,
+    hex_attribute,
 )
 from kifurushi.utils.random_values import (
     LEFT_BYTE,
@@ -103,6 +106,19 @@ def hex_object():
 class TestHexMixin:
     """Tests class HexMixin"""
 
+    def test_should_instantiate_slotted_subclass(self):
+        @attr.s(slots=True, repr=False)
+        class SlottedHex(HexMixin):
+            _hex: bool = hex_attribute()
+            _name: str = attr.ib(default='foo')
+            _default: int = attr.ib(default=2)
+            _value: int = attr.ib(default=2)
+
+        hex_object = SlottedHex(hex=True)
+
+        assert hex_object.hex is True
+        assert '<SlottedHex: name=foo, value=0x2, default=0x2>' == repr(hex_object)
+
     # noinspection PyArgumentList
     def test_should_raise_error_when_instantiating_hex_attribute_without_keyword_argument(self):
         with pytest.raises(TypeError):
@@ -158,6 +174,22 @@ class TestNumericField:
 
             assert f'foo value must be between {left + 1} and {right - 1}' == str(exc_info.value)
 
+    @pytest.mark.parametrize('value', ['4', 4.5])
+    def test_should_raise_error_when_value_attribute_is_not_an_integer(self, value):
+        field = ShortField('foo', 2)
+        with pytest.raises(TypeError) as exc_info:
+            field.value = value
+
+        assert f'foo value must be an integer but you provided {value!r}' == str(exc_info.value)
+        assert 2 == field.value
+
+    def test_should_keep_previous_value_when_setting_an_incorrect_value(self):
+        field = ByteField('foo', 2)
+        with pytest.raises(ValueError):
+            field.value = RIGHT_BYTE + 1
+
+        assert 2 == field.value
+
     @pytest.mark.parametrize(('field_class', 'value'), WITHIN_BOUNDARIES)
     def test_should_set_value_attribute_when_giving_correct_value(self, field_class, value):
         field = field_class('foo', 2)
@@ -165,6 +197,28 @@ class TestNumericField:
 
         assert value == field.value
 
+    def test_should_not_have_instance_dict(self):
+        field = ShortField('foo', 2, hex=True)
+
+        assert not hasattr(field, '__dict__')
+        assert field.hex is True
+
+    def test_should_check_boundaries_when_using_a_subclass_of_a_numeric_field(self):
+        @attr.s(repr=False, slots=True)
+        class PortField(ShortField):
+            pass
+
+        with pytest.raises(ValueError) as exc_info:
+            PortField('port', RIGHT_SHORT + 1)
+
+        assert f'port default must be between {LEFT_SHORT} and {RIGHT_SHORT}' == str(exc_info.value)
+
+    def test_should_not_check_boundaries_when_field_class_does_not_define_them(self):
+        field = NumericField('foo', RIGHT_LONG + 1, format='B')
+        field.value = LEFT_SIGNED_LONG - 1
+
+        assert LEFT_SIGNED_LONG - 1 == field.value
+
     @pytest.mark.parametrize(
         ('field_class', 'size', 'struct_format'),
         [
@@ -233,6 +287,46 @@ class TestNumericField:
         assert value == field.value
         assert field.value_was_computed is True
 
+    @pytest.mark.parametrize(
+        ('field_class', 'value'),
+        [
+            (ByteField, LEFT_BYTE),
+            (ByteField, RIGHT_BYTE),
+            (SignedByteField, LEFT_SIGNED_BYTE),
+            (SignedByteField, -1),
+            (SignedByteField, RIGHT_SIGNED_BYTE),
+        ],
+    )
+    def test_should_compute_byte_value_like_struct_module(self, field_class, value):
+        field = field_class('foo', 2)
+        data = struct.pack(field.struct_format, value)
+
+        assert b'' == field.compute_value(data)
+        assert value == field.value
+
+    @pytest.mark.parametrize(('field_class', 'format_'), [(ByteField, 'B'), (SignedByteField, 'b'), (IntField, 'I')])
+    def test_should_compute_value_at_offset_and_return_next_offset(self, field_class, format_):
+        field = field_class('foo', 2)
+        data = b'hi' + struct.pack(f'!{format_}', 6) + b'hello'
+
+        assert 2 + field.size == field.compute_value_at(data, 2)
+        assert 6 == field.value
+        assert field.value_was_computed is True
+
+    @pytest.mark.parametrize('field_class', [ByteField, SignedByteField, IntField])
+    def test_should_return_data_length_when_not_enough_data_to_compute_at_offset(self, field_class):
+        field = field_class('foo', 2)
+
+        assert 3 == field.compute_value_at(b'hi\x00', 3)
+        assert field.value_was_computed is False
+
+    @pytest.mark.parametrize('field_class', [ByteField, SignedByteField])
+    def test_should_return_empty_byte_when_there_is_no_data_to_compute_byte(self, field_class):
+        field = field_class('foo', 2)
+
+        assert b'' == field.compute_value(b'')
+        assert field.value_was_computed is False
+
     @pytest.mark.parametrize('field_class', [SignedIntField, LongField])
     def test_should_return_empty_byte_when_not_enough_data_to_compute(self, field_class):
         field = field_class('foo', 2)
@@ -257,6 +351,16 @@ class TestEnumToDict:
 
         assert {1: 'MICKEY', 2: 'MINNIE'} == enum_to_dict(Disney)
 
+    def test_should_return_a_new_dict_each_time_for_the_same_enum_class(self):
+        class Disney(enum.Enum):
+            MICKEY = 1
+            MINNIE = 2
+
+        first_mapping = enum_to_dict(Disney)
+        first_mapping[3] = 'DONALD'
+
+        assert {1: 'MICKEY', 2: 'MINNIE'} == enum_to_dict(Disney)
+
 
 # noinspection PyArgumentList
 class TestEnumFields:
@@ -319,6 +423,15 @@ class TestEnumFields:
                 exc_info.value
             )
 
+    def test_should_not_check_enumeration_keys_when_field_class_does_not_define_boundaries(self):
+        @attr.s(repr=False, slots=True)
+        class DummyEnum(NumericField, EnumMixin):
+            pass
+
+        field = DummyEnum('foo', 2, {RIGHT_LONG + 1: 'big'}, format='B')
+
+        assert {RIGHT_LONG + 1: 'big'} == field.enumeration
+
     # noinspection PyTypeChecker
     @pytest.mark.parametrize('enumeration', [{1: 'mickey', 2: 'minnie'}, enum.Enum('Disney', 'mickey minnie')])
     @pytest.mark.parametrize(
@@ -416,6 +529,17 @@ class TestFixedStringField:
 
         assert b'h' * 8 == field.raw()
 
+    def test_should_reuse_encoded_value_until_value_changes(self):
+        field = FixedStringField('foo', 'hello', 5, decode=True)
+        raw = field.raw()
+
+        assert raw is field.raw()
+
+        field.compute_value(b'world')
+        assert b'world' == field.raw()
+        field.value = 'apple'
+        assert b'apple' == field.raw()
+
     # test of value property
 
     @pytest.mark.parametrize(
@@ -490,6 +614,14 @@ class TestFixedStringField:
         assert value == field.value
         assert field.value_was_computed is True
 
+    @pytest.mark.parametrize(('default', 'value', 'decode'), [('h' * 4, 'b' * 4, True), (b'h' * 4, b'b' * 4, False)])
+    def test_should_compute_string_at_offset_and_return_next_offset(self, default, value, decode):
+        field = FixedStringField('foo', default, 4, decode=decode)
+
+        assert 6 == field.compute_value_at(b'hibbbbye', 2)
+        assert value == field.value
+        assert field.value_was_computed is True
+
     @pytest.mark.parametrize(('default', 'decode'), [('h' * 8, True), (b'h' * 8, False)])
     def test_should_return_empty_byte_when_not_enough_data_to_compute(self, default, decode):
         field = FixedStringField('foo', default, 8, decode=decode)
@@ -691,6 +823,11 @@ class TestBitsField:
         assert self.get_int_from_tuple(4, (4, 5)) == field.default
         assert not field.hex
 
+    def test_should_compute_shift_and_mask_of_each_field_part(self):
+        field = BitsField([FieldPart('flags', 2, 3), FieldPart('offset', 0, 13)], format='H')
+
+        assert ((13, 0b111), (0, 2**13 - 1)) == field._layout
+
     @pytest.mark.parametrize(('value_1', 'value_2', 'hexadecimal'), [(4, 5, False), ('0x4', '0x5', True)])
     def test_should_correctly_represent_bits_field(self, value_1, value_2, hexadecimal):
         field_parts = [FieldPart('version', 4, 4), FieldPart('IHL', 5, 4)]
@@ -842,6 +979,13 @@ class TestBitsField:
         assert field.value_as_tuple == (8, 11)
         assert field.value_was_computed is True
 
+    def test_should_compute_field_parts_at_offset_and_return_next_offset(self):
+        field = ByteBitsField([FieldPart('version', 4, 4), FieldPart('IHL', 5, 4)])
+
+        assert 2 == field.compute_value_at(b'\x00\x8b\x00', 1)
+        assert (8, 11) == field.value_as_tuple
+        assert field.value_was_computed is True
+
     @pytest.mark.parametrize(('size', 'format_'), [(16, 'I'), (32, 'Q')])
     def test_should_return_empty_byte_when_not_enough_data_to_compute(self, size, format_):
         field = BitsField(parts=[FieldPart('version', 4, size), FieldPart('IHL', 5, size)], format=format_)
@@ -850,6 +994,13 @@ class TestBitsField:
         assert remaining_bytes == b''
         assert field.value_was_computed is False
 
+    def test_should_not_have_instance_dict_for_field_and_field_parts(self):
+        field = ByteBitsField([FieldPart('version', 4, 4), FieldPart('IHL', 5, 4)], hex=True)
+
+        assert not hasattr(field, '__dict__')
+        assert not any(hasattr(part, '__dict__') for part in field.parts)
+        assert all(part.hex for part in field.parts)
+
     # test of __getitem__ method
 
     @size_format_parametrize
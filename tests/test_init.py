@@ -0,0 +1,59 @@
+import importlib
+import inspect
+import re
+import subprocess  # nosec
+import sys
+
+import pytest
+
+import kifurushi
+from kifurushi.fields import ShortField
+from kifurushi.utils.network import checksum
+
+
+class TestLazyImports:
+    """Tests lazy import of the package objects"""
+
+    @pytest.mark.parametrize(('name', 'value'), [('ShortField', ShortField), ('checksum', checksum)])
+    def test_should_return_object_of_submodule_when_accessing_package_attribute(self, name, value):
+        vars(kifurushi).pop(name, None)
+
+        assert getattr(kifurushi, name) is value
+        # the object is now directly stored in the package namespace
+        assert vars(kifurushi)[name] is value
+
+    @pytest.mark.parametrize('name', ['abc', 'fields', 'packet', 'utils'])
+    def test_should_return_submodule_when_accessing_package_attribute(self, name):
+        vars(kifurushi).pop(name, None)
+
+        assert getattr(kifurushi, name) is importlib.import_module(f'kifurushi.{name}')
+        assert vars(kifurushi)[name] is sys.modules[f'kifurushi.{name}']
+
+    def test_should_return_submodule_in_a_new_interpreter_after_importing_the_package(self):
+        code = 'import kifurushi; print(kifurushi.fields.__name__, kifurushi.packet.__name__)'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)  # noqa: S603
+
+        assert 'kifurushi.fields kifurushi.packet' == result.stdout.strip()
+
+    def test_should_export_every_lazily_imported_object(self):
+        # noinspection PyProtectedMember
+        assert sorted(kifurushi._object_modules) == sorted(kifurushi.__all__)
+
+    def test_should_import_public_objects_for_type_checkers(self):
+        source = inspect.getsource(kifurushi)
+        type_checking_block = source[source.index('if TYPE_CHECKING:') : source.index('# maps each public object')]
+
+        for name in kifurushi.__all__:
+            assert re.search(rf'\b{name}\b', type_checking_block), name
+
+    def test_should_raise_error_when_accessing_unknown_package_attribute(self):
+        with pytest.raises(AttributeError) as exc_info:
+            kifurushi.foo  # noqa: B018
+
+        assert 'module kifurushi has no attribute foo' == str(exc_info.value)
+
+    def test_should_list_all_public_objects_when_calling_dir_function(self):
+        names = dir(kifurushi)
+
+        for name in kifurushi.__all__:
+            assert name in names
@@ -1,16 +1,19 @@
 from typing import List
 
+import attr
 import pytest
 
 from kifurushi.abc import Field, VariableStringField
 from kifurushi.fields import (
     ByteBitsField,
+    ByteField,
     ConditionalField,
     FieldPart,
     FixedStringField,
     ShortBitsField,
     ShortEnumField,
     ShortField,
+    SignedIntField,
 )
 from kifurushi.packet import Packet, create_packet_class, extract_layers
 from kifurushi.utils.random_values import RIGHT_SHORT
@@ -103,6 +106,66 @@ class Fruit(Packet):
     ]
 
 
+class DoubleShortField(ShortField):
+    def raw(self, packet: Packet = None) -> bytes:
+        return self._struct.pack(self._value * 2)
+
+    def compute_value(self, data: bytes, packet: Packet = None) -> bytes:
+        remaining_data = super().compute_value(data, packet)
+        self._value //= 2
+        return remaining_data
+
+
+class TracedShortField(ShortField):
+    def compute_value(self, data: bytes, packet: Packet = None) -> bytes:
+        self.traced = True
+        return super().compute_value(data, packet)
+
+
+@attr.s(slots=True, repr=False)
+class FrostingBitsField(ByteBitsField):
+    def raw(self, packet: Packet = None) -> bytes:
+        return super().raw(packet)
+
+
+class TracedAtOffsetShortField(ShortField):
+    def compute_value_at(self, data: bytes, offset: int, packet: Packet = None) -> int:
+        self.traced = True
+        return super().compute_value_at(data, offset, packet)
+
+
+# noinspection PyArgumentList
+class Pastry(Packet):
+    __fields__ = [
+        ShortField('butter', 1),
+        FixedStringField('shape', b'ring', 4),
+        ByteField('sugar', 2),
+        FixedStringField('name', 'donut', 5, decode=True),
+        TracedAtOffsetShortField('flour', 3),
+        ShortField('eggs', 4),
+    ]
+
+
+# noinspection PyArgumentList
+class Cake(Packet):
+    __fields__ = [
+        ShortField('eggs', 3),
+        ByteField('sugar', 2),
+        ConditionalField(ShortField('chocolate', 5), lambda p: p.eggs > 2),
+        SignedIntField('butter', -1, order='<'),
+        ShortField('milk', 1, order='<'),
+        ByteField('flour', 4, order='@'),
+        ShortField('salt', 6),
+        DoubleShortField('yeast', 7),
+        FixedStringField('name', b'cake', 4),
+        ShortField('cream', 8),
+        TracedShortField('cherry', 1),
+        ByteBitsField([FieldPart('layers', 2, 4), FieldPart('candles', 3, 4)]),
+        ShortBitsField([FieldPart('slices', 8, 16)]),
+        FrostingBitsField([FieldPart('vanilla', 1, 1), FieldPart('lemon', 5, 7)]),
+    ]
+
+
 # noinspection PyArgumentList
 class TestPacketClass:
     """Tests Packet class implementation through the use of custom MiniIP class"""
@@ -222,6 +285,126 @@ class TestPacketClass:
         fruit = Fruit(apples=apples, pie=pie, juice=juice)
         assert data == fruit.raw
 
+    @pytest.mark.parametrize('eggs', [2, 3])
+    def test_should_compute_packet_byte_value_when_mixing_fields_of_different_kinds(self, eggs):
+        cake = Cake(eggs=eggs, cream=9)
+        data = b''.join(field.raw(cake) for field in cake._fields)
+
+        assert data == cake.raw
+        # computing the byte value a second time uses the serialization plan stored in the class
+        cake.salt = 3
+        assert b''.join(field.raw(cake) for field in cake._fields) == cake.raw
+
+    def test_should_evaluate_each_condition_once_when_computing_packet_byte_value(self, mocker):
+        condition = mocker.Mock(return_value=True)
+        packet_class = create_packet_class(
+            'Cheese',
+            [ShortField('age', 1), ConditionalField(FixedStringField('origin', b'fr', 2), lambda p: condition(p))],
+        )
+        cheese = packet_class()
+
+        assert b'\x00\x01fr' == cheese.raw
+        condition.assert_called_once_with(cheese)
+
+    def test_should_evaluate_shared_condition_once_when_computing_packet_byte_value(self, mocker):
+        condition = mocker.Mock(return_value=True)
+
+        def is_ripe(packet: Packet) -> bool:
+            return condition(packet)
+
+        packet_class = create_packet_class(
+            'Cheese',
+            [
+                ShortField('age', 1),
+                ConditionalField(ShortField('weight', 2), is_ripe),
+                ConditionalField(FixedStringField('origin', b'fr', 2), is_ripe),
+            ],
+        )
+        cheese = packet_class()
+
+        assert b'\x00\x01\x00\x02fr' == cheese.raw
+        condition.assert_called_once_with(cheese)
+
+    def test_should_reuse_packet_byte_value_until_an_attribute_is_set(self):
+        mini_ip = MiniIP()
+        raw = mini_ip.raw
+
+        assert mini_ip.raw is raw
+
+        mini_ip.length = 30
+        assert b'\x00\x1e' == mini_ip.raw[1:3]
+        assert MiniIP(length=30).raw == mini_ip.raw
+
+    @pytest.mark.parametrize(('name', 'value'), [('salt', 30), ('candles', 5), ('name', b'tart')])
+    def test_should_compute_packet_byte_value_again_when_a_field_attribute_is_set(self, name, value):
+        cake = Cake()
+        raw = cake.raw
+        setattr(cake, name, value)
+
+        assert cake.raw != raw
+        assert Cake(**{name: value}).raw == cake.raw
+
+    def test_should_keep_packet_byte_value_when_a_non_field_attribute_is_set(self):
+        mini_ip = MiniIP()
+        mini_ip.note = 'fast'
+
+        assert '_raw_cache' not in vars(mini_ip)
+        raw = mini_ip.raw
+        mini_ip.note = 'faster'
+        assert mini_ip.raw is raw
+
+    def test_should_not_reuse_packet_byte_value_when_fields_can_read_other_packet_attributes(self, mocker):
+        cake = Cake()
+        raw_spy = mocker.spy(cake._fields[8], 'raw')
+
+        assert cake.raw == cake.raw
+        assert 2 == raw_spy.call_count
+        assert '_raw_cache' not in vars(cake)
+
+    def test_should_compute_packet_byte_value_when_a_field_value_is_modified_in_place(self):
+        cake = Cake(name=bytearray(b'cake'))
+        assert b'cake' in cake.raw
+        cake.name[0:4] = b'tart'
+
+        assert Cake(name=b'tart').raw == cake.raw
+
+    def test_should_compute_packet_byte_value_when_a_field_depends_on_a_non_field_attribute(self):
+        class PayloadLengthField(ShortField):
+            def raw(self, packet: Packet = None) -> bytes:
+                return self._struct.pack(len(packet.payload))
+
+        packet_class = create_packet_class('Envelope', [ByteField('kind', 1), PayloadLengthField('length', 0)])
+        envelope = packet_class()
+        envelope.payload = b'abc'
+        assert b'\x01\x00\x03' == envelope.raw
+
+        envelope.payload = b'abcdef'
+        assert b'\x01\x00\x06' == envelope.raw
+
+    def test_should_compute_packet_byte_value_when_a_condition_depends_on_a_non_field_attribute(self):
+        packet_class = create_packet_class(
+            'Cheese',
+            [ShortField('age', 1), ConditionalField(ShortField('weight', 2), lambda p: getattr(p, 'heavy', False))],
+        )
+        cheese = packet_class()
+        assert b'\x00\x01' == cheese.raw
+
+        cheese.heavy = True
+        assert b'\x00\x01\x00\x02' == cheese.raw
+
+    def test_should_compute_packet_byte_value_again_after_parsing_data(self):
+        default_values = []
+
+        class RecordedBody(MiniBody):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                default_values.append(self.raw)
+
+        body = RecordedBody.from_bytes(b'\x00\x03\x02\x00\x04\x00\x21\x05')
+
+        assert [MiniBody().raw] == default_values
+        assert b'\x00\x03\x02\x00\x04\x00\x21\x05' == body.raw
+
     # test of all_fields_are_computed property
 
     def test_should_return_false_when_data_is_incomplete(self):
@@ -312,6 +495,67 @@ class TestPacketClass:
         assert 5 == new_ip.version
         assert 18 == new_ip.length
 
+    def test_should_unpack_bits_fields_together_with_numeric_fields(self):
+        mini_ip = MiniIP(version=6, ihl=15, length=18, identification=7, flags=2, offset=1234)
+        new_ip = MiniIP.from_bytes(mini_ip.raw)
+
+        assert 1 == len(MiniIP._get_parse_plan(new_ip._fields))
+        assert new_ip == mini_ip
+        assert new_ip.all_fields_are_computed is True
+        for name in ['version', 'ihl', 'length', 'identification', 'flags', 'offset']:
+            assert getattr(new_ip, name) == getattr(mini_ip, name)
+        assert (6, 15) == new_ip._fields[0].value_as_tuple
+        assert (2, 1234) == new_ip._fields[3].value_as_tuple
+
+    @pytest.mark.parametrize('eggs', [2, 3])
+    def test_should_create_packet_from_bytes_when_mixing_fields_of_different_kinds(self, eggs):
+        cake = Cake(
+            eggs=eggs, sugar=3, butter=-4, milk=2, flour=7, salt=1, yeast=5, name=b'tart', cream=9, candles=12, lemon=2
+        )
+        new_cake = Cake.from_bytes(cake.raw)
+
+        assert new_cake == cake
+        assert new_cake.all_fields_are_computed is True
+        for name in ['eggs', 'sugar', 'butter', 'milk', 'flour', 'salt', 'yeast', 'name', 'cream', 'cherry', 'candles']:
+            assert getattr(new_cake, name) == getattr(cake, name)
+        # fields with a custom compute_value method are parsed with it
+        assert new_cake._fields[10].traced is True
+
+    def test_should_only_parse_fields_at_offset_when_compute_value_is_not_overridden(self):
+        plan = Cake._get_parse_plan(Cake()._fields)
+        at_offset = {index: flag for _, steps in plan for index, _, flag in steps}
+
+        # conditional field
+        assert at_offset[2] is False
+        # field with a custom compute_value method
+        assert at_offset[7] is False
+        # fixed string field
+        assert at_offset[8] is True
+
+    def test_should_unpack_bytes_fields_together_with_numeric_fields(self):
+        pastry = Pastry(butter=5, shape=b'bowl', sugar=7, name='churr', flour=9, eggs=11)
+        new_pastry = Pastry.from_bytes(pastry.raw)
+        plan = Pastry._get_parse_plan(new_pastry._fields)
+
+        # decoded strings and fields with a custom compute_value_at method are parsed with their own method
+        assert [3, 1, 1, 1] == [len(steps) for _, steps in plan]
+        assert [True, False, False, False] == [unpacker is not None for unpacker, _ in plan]
+        assert new_pastry == pastry
+        assert new_pastry.all_fields_are_computed is True
+        for name in ['butter', 'shape', 'sugar', 'name', 'flour', 'eggs']:
+            assert getattr(new_pastry, name) == getattr(pastry, name)
+        assert new_pastry._fields[4].traced is True
+
+    def test_should_create_packet_from_incomplete_bytes_when_mixing_fields_of_different_kinds(self):
+        cake = Cake.from_bytes(b'\x00\x01\x02\xfc\xff')
+
+        assert cake.all_fields_are_computed is False
+        assert cake.eggs == 1
+        assert cake.sugar == 2
+        assert cake.butter == -1
+        for field in cake.fields[3:]:
+            assert field.value_was_computed is False
+
     @pytest.mark.parametrize(
         ('apples', 'pie', 'juice', 'data'), [(2, 2, 1, b'\x00\x02\x00\x02'), (4, 1, 2, b'\x00\x04\x00\x02')]
     )
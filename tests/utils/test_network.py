@@ -1,4 +1,5 @@
 import pytest
+from scapy.utils import hexdump as scapy_hexdump
 
 from kifurushi.utils.network import check_endian_transform, checksum, hexdump, smart_ord
 
@@ -19,6 +20,17 @@ class TestHexdump:
     def test_should_return_correct_hexadecimal_wireshark_view_when_calling_hexdump(self, custom_ip, mini_ip_hexdump):
         assert mini_ip_hexdump == hexdump(custom_ip.raw)
 
+    @pytest.mark.parametrize('data', [b'', b'hello world\x00\x01\x7f\xff kifurushi packets!', bytes(range(256))])
+    def test_should_return_same_view_as_scapy_when_giving_data_of_various_lengths(self, data):
+        assert scapy_hexdump(data, dump=True) == hexdump(data)
+
+    @pytest.mark.parametrize('data', ['hello world\x00\x01\x7f\xff kifurushi packets!', bytearray(b'hello\x00world')])
+    def test_should_return_same_view_as_bytes_when_giving_string_or_bytearray(self, data):
+        expected = data.encode('latin-1') if isinstance(data, str) else bytes(data)
+
+        assert hexdump(expected) == hexdump(data)
+        assert scapy_hexdump(expected, dump=True) == hexdump(data)
+
 
 class TestCheckEndianTransform:
     """tests function check_endian_transform."""
@@ -44,3 +56,17 @@ class TestChecksum:
 
     def test_should_return_correct_checksum_when_calling_checksum_with_valid_argument(self, mini_ip_checksum):
         assert mini_ip_checksum == checksum(MiniIP().raw)
+
+    @pytest.mark.parametrize(
+        ('data', 'value'),
+        [
+            (b'', 0xFFFF),
+            (b'\x00\x00', 0xFFFF),
+            (b'\xff\xff\xff\xff', 0),
+            (b'\x12\x34\xed\xcb', 0),
+            (b'\xff', 0x00FF),
+            (b'\x01\x02\x03', 0xFBFD),
+        ],
+    )
+    def test_should_return_correct_checksum_when_giving_edge_case_data(self, data, value):
+        assert value == checksum(data)